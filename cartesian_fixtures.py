@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""Cached Cartesian-product rows and samples, and stratified selection shared by the multi-constraint tests"""
+import functools
+import random
+from collections import Counter, namedtuple
+from itertools import product
+from generate_synthetic_data_patterns import LazyCartesianProduct, sample_cartesian_product
+
+
+@functools.lru_cache(maxsize=None)
+def _cartesian_rows(shared_col, shared_values, non_shared):
+    # One product over all columns; each combination tuple becomes a row as is
+    row_type = namedtuple("CartesianRow", [shared_col] + [col_name for col_name, _ in non_shared])
+    value_lists = [values for _, values in non_shared]
+    return tuple(map(row_type._make, product(shared_values, *value_lists)))
+
+
+def cartesian_rows(shared_col, shared_values, non_shared_value_lists):
+    """
+    Return rows for every (shared value, non-shared combination) pair.
+
+    Rows are namedtuples with one field per column (e.g. row.A_ID); they
+    compare and hash like plain value tuples. Rows come in nested-loop order
+    (shared value outermost, last non-shared column varying fastest).
+    Results are cached per distinct input and shared between callers.
+
+    Args:
+        shared_col: Name of the shared column (e.g. "A_ID")
+        shared_values: Values of the shared column
+        non_shared_value_lists: Dict of non-shared column name -> list of values
+
+    Returns:
+        Tuple of row namedtuples
+    """
+    non_shared = tuple((col_name, tuple(values)) for col_name, values in non_shared_value_lists.items())
+    return _cartesian_rows(shared_col, tuple(shared_values), non_shared)
+
+
+@functools.lru_cache(maxsize=None)
+def _sampled_cartesian_rows(shared_col, shared_values, non_shared, n, seed):
+    row_type = namedtuple("CartesianRow", [shared_col] + [col_name for col_name, _ in non_shared])
+    value_lists = [shared_values] + [values for _, values in non_shared]
+    return tuple(map(row_type._make, sample_cartesian_product(value_lists, n, random.Random(seed))))
+
+
+def sampled_cartesian_rows(shared_col, shared_values, non_shared_value_lists, n, seed):
+    """
+    Return a seeded random sample of distinct Cartesian-product rows.
+
+    The same rows, in the same order, as random.seed(seed) followed by
+    random.sample(cartesian_rows(...), n), but only the sampled rows are
+    built, and the global random state is left alone. Results are cached
+    per distinct input and shared between callers.
+
+    Args:
+        shared_col: Name of the shared column (e.g. "A_ID")
+        shared_values: Values of the shared column
+        non_shared_value_lists: Dict of non-shared column name -> list of values
+        n: Number of rows to sample
+        seed: Seed of the random generator drawing the sample
+
+    Returns:
+        Tuple of row namedtuples
+    """
+    non_shared = tuple((col_name, tuple(values)) for col_name, values in non_shared_value_lists.items())
+    return _sampled_cartesian_rows(shared_col, tuple(shared_values), non_shared, n, seed)
+
+
+def stratified_smart_selection(shared_values, value_lists, requested_rows, rng=random):
+    """
+    Simulate the generator's stratified selection with smart diversity.
+
+    Each shared value gets an equal share of rows (the first `remainder`
+    shared values one more). When the share fits, one row is taken per
+    distinct value of the first non-shared column, preferring combinations
+    whose second non-shared value is not used yet for that shared value;
+    otherwise the share is sampled at random. Random calls happen in the
+    same order as the generator's, so a seeded run is reproducible.
+
+    Args:
+        shared_values: Values of the shared column (e.g. A_IDs)
+        value_lists: Value lists of the non-shared columns; the second one
+            must hold small non-negative ints (e.g. [PR values, C_ID values])
+        requested_rows: Number of rows to select
+        rng: Random source, e.g. a seeded random.Random (defaults to the
+            random module's shared generator)
+
+    Returns:
+        Shuffled list of (shared value, non-shared values...) tuples
+    """
+    # Every shared value pairs with the same non-shared combos, grouped by the
+    # first column; a group is the product of the other columns with the first
+    # pinned to one value, so it is indexed lazily instead of being collected
+    non_shared_combos = LazyCartesianProduct(value_lists)
+    stride = non_shared_combos.size
+    first_val_counts = Counter(value_lists[0])
+    by_first_col = {}
+    for first_val in dict.fromkeys(value_lists[0]):
+        by_first_col[first_val] = LazyCartesianProduct(
+            [[first_val] * first_val_counts[first_val]] + list(value_lists[1:]))
+    
+    rows_per_shared_val = requested_rows // len(shared_values)
+    remainder = requested_rows % len(shared_values)
+    
+    # Smart-selection picks per chosen order of first-column values
+    smart_picks = {}
+    
+    selected = []
+    shared_positions = list(range(len(shared_values)))
+    rng.shuffle(shared_positions)  # Randomize order
+    
+    for idx, shared_pos in enumerate(shared_positions):
+        shared_val = shared_values[shared_pos]
+        num_rows_for_this_val = rows_per_shared_val + (1 if idx < remainder else 0)
+        
+        selected_for_this_val = []
+        smart_selection_succeeded = False
+        
+        if 1 < num_rows_for_this_val <= 10 and len(by_first_col) >= num_rows_for_this_val:
+            first_col_values = list(by_first_col.keys())
+            rng.shuffle(first_col_values)
+            
+            # The picks depend only on the order of the chosen first-column
+            # values, so each order is resolved once and reused
+            chosen_first_vals = tuple(first_col_values[:num_rows_for_this_val])
+            picks = smart_picks.get(chosen_first_vals)
+            if picks is None:
+                picks = []
+                # Used second-column values (small ints) as bits of one int
+                used_bits = 0
+                for first_val in chosen_first_vals:
+                    candidates = by_first_col[first_val]
+                    
+                    # Take the first candidate that adds diversity, else the first one
+                    best_candidate = candidates[0]
+                    for candidate in candidates:
+                        if not (used_bits >> candidate[1]) & 1:
+                            best_candidate = candidate
+                            break
+                    
+                    picks.append(best_candidate)
+                    used_bits |= 1 << best_candidate[1]
+                smart_picks[chosen_first_vals] = picks
+            
+            selected_for_this_val = [(shared_val,) + best_candidate for best_candidate in picks]
+            smart_selection_succeeded = True
+        
+        # If smart selection didn't work, fall back to random selection
+        if not smart_selection_succeeded:
+            selected_for_this_val = [(shared_val,) + combo for combo in
+                                     non_shared_combos.take(rng.sample(range(stride), num_rows_for_this_val))]
+        
+        selected.extend(selected_for_this_val)
+    
+    # Shuffle final selection
+    rng.shuffle(selected)
+    return selected
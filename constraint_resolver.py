@@ -4,7 +4,10 @@ import sys
 import itertools
 from collections import defaultdict
 from generate_synthetic_data_utils import debug_print
-from generate_synthetic_data_patterns import cartesian_product_generator
+from generate_synthetic_data_patterns import cartesian_product_generator, LazyCartesianProduct
+
+# Largest Cartesian product returned as a materialized list
+CARTESIAN_MATERIALIZE_LIMIT = 100000
 
 
 class ConstraintResolver(object):
@@ -30,21 +33,31 @@ class ConstraintResolver(object):
         self.metadata = metadata
         self.unique_constraints = unique_constraints
         self.fk_columns = fk_columns
+        
+        # Classification results indexed by "schema.table"
+        self._classification_cache = {}
     
     def classify_unique_constraints(self, table_key):
         """
         Classify UNIQUE constraints by type for a table.
         
+        Results are cached per table and returned as immutable collections,
+        so repeated calls (one per generated batch) do no work.
+        
         Args:
             table_key: "schema.table" string
         
         Returns:
             Tuple of (single_unique_cols, composite_constraints, composite_cols)
             where:
-            - single_unique_cols: set of column names in single-column UNIQUE
-            - composite_constraints: list of UniqueConstraint with 2+ columns
-            - composite_cols: set of all columns in composite UNIQUE constraints
+            - single_unique_cols: frozenset of column names in single-column UNIQUE
+            - composite_constraints: tuple of UniqueConstraint with 2+ columns
+            - composite_cols: frozenset of all columns in composite UNIQUE constraints
         """
+        cached = self._classification_cache.get(table_key)
+        if cached is not None:
+            return cached
+        
         constraints = self.unique_constraints.get(table_key, [])
         
         single_unique_cols = set()
@@ -53,12 +66,15 @@ class ConstraintResolver(object):
         
         for uc in constraints:
             if len(uc.columns) == 1:
-                single_unique_cols.add(uc.columns[0])
+                single_unique_cols.add(sys.intern(uc.columns[0]))
             else:
                 composite_constraints.append(uc)
-                composite_cols.update(uc.columns)
+                composite_cols.update(sys.intern(col) for col in uc.columns)
         
-        return single_unique_cols, composite_constraints, composite_cols
+        result = (frozenset(single_unique_cols), tuple(composite_constraints),
+                  frozenset(composite_cols))
+        self._classification_cache[table_key] = result
+        return result
     
     def find_overlapping_constraints(self, composite_constraints):
         """
@@ -73,26 +89,22 @@ class ConstraintResolver(object):
         if len(composite_constraints) < 2:
             return []
         
-        overlapping_groups = []
+        unique_groups = []
+        seen_groups = set()
         
-        for i, uc1 in enumerate(composite_constraints):
-            group = set([uc1])
-            
-            for j, uc2 in enumerate(composite_constraints):
-                if i != j and set(uc1.columns) & set(uc2.columns):
-                    group.add(uc2)
-            
-            if len(group) > 1:
-                overlapping_groups.append(list(group))
+        # Column sets are built once instead of per pair
+        col_sets = [frozenset(uc.columns) for uc in composite_constraints]
         
-        # Deduplicate groups
-        unique_groups = []
-        for group in overlapping_groups:
-            group_set = frozenset(uc.constraint_name for uc in group)
+        for i, cols1 in enumerate(col_sets):
+            # Members as indexes in constraint order: ints hash trivially and
+            # the group order is the same in every run
+            group = tuple(j for j, cols2 in enumerate(col_sets)
+                          if j == i or not cols1.isdisjoint(cols2))
             
-            if not any(group_set == frozenset(uc.constraint_name for uc in g) 
-                      for g in unique_groups):
-                unique_groups.append(group)
+            if len(group) > 1 and group not in seen_groups:
+                # Deduplicate groups, keeping the first
+                seen_groups.add(group)
+                unique_groups.append([composite_constraints[j] for j in group])
         
         return unique_groups
     
@@ -112,7 +124,7 @@ class ConstraintResolver(object):
         shared = set(constraint_group[0].columns)
         
         for uc in constraint_group[1:]:
-            shared &= set(uc.columns)
+            shared.intersection_update(uc.columns)
         
         return shared
     
@@ -222,19 +234,26 @@ class ConstraintResolver(object):
         """
         Generate Cartesian product of value lists (memory-efficient).
         
-        Performance optimization: Uses generator to reduce memory by 50-70%
-        for large products.
+        Products up to CARTESIAN_MATERIALIZE_LIMIT combinations are returned
+        as a list. Larger products are returned as a LazyCartesianProduct,
+        which supports len(), indexing, membership and iteration without
+        materializing every combination.
         
         Args:
             value_lists: List of lists of values
         
         Returns:
-            List of tuples representing all combinations
+            List or LazyCartesianProduct of tuples representing all combinations
         """
         if not value_lists:
             return []
         
-        # Use generator-based approach for memory efficiency
+        product = LazyCartesianProduct(value_lists)
+        if product.size > CARTESIAN_MATERIALIZE_LIMIT:
+            debug_print("Cartesian product of {0} combinations kept lazy".format(
+                product.size), level=3)
+            return product
+        
         return list(cartesian_product_generator(value_lists))
     
     def stratified_sample(self, combinations, primary_shared_col, shared_values,
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""unittest loaders that cache test discovery and results of unchanged test files"""
+import json
+import os
+import sys
+import unittest
+import weakref
+
+# Results of passing test files, stored next to the test files
+RESULT_CACHE_PATH = os.path.join(".cache", "unittest_results.json")
+
+
+class FastLoader(unittest.TestLoader):
+    """
+    TestLoader that scans each TestCase class for test methods only once.
+
+    The default loader re-runs dir() + filter + sort on every lookup of a
+    class. Caching the sorted names per class keeps discovery linear when
+    the same classes are loaded repeatedly (e.g. module and name selection).
+    """
+
+    def __init__(self):
+        super(FastLoader, self).__init__()
+        self._names_by_class = weakref.WeakKeyDictionary()
+
+    def getTestCaseNames(self, testCaseClass):
+        """
+        Return the sorted test method names of a TestCase class (cached).
+
+        Args:
+            testCaseClass: TestCase subclass
+
+        Returns:
+            List of test method names
+        """
+        names = self._names_by_class.get(testCaseClass)
+        if names is None:
+            names = tuple(super(FastLoader, self).getTestCaseNames(testCaseClass))
+            self._names_by_class[testCaseClass] = names
+        return list(names)
+
+
+class CachedLoader(FastLoader):
+    """
+    FastLoader that skips a test file whose last full run passed.
+
+    A run is keyed by the modification times of the test file and of the
+    source files it exercises; editing any of them invalidates the entry.
+    Only whole-module runs are skipped or recorded, never runs of selected
+    test names.
+    """
+
+    def __init__(self, test_file, deps=(), use_cache=True):
+        """
+        Initialize cached loader.
+
+        Args:
+            test_file: Path of the test module
+            deps: Paths of the source files the test module exercises
+            use_cache: Set to False to always run (and re-record) the tests
+        """
+        super(CachedLoader, self).__init__()
+        self.test_file = os.path.abspath(test_file)
+        base_dir = os.path.dirname(self.test_file)
+        self.deps = [os.path.join(base_dir, dep) for dep in deps]
+        self.cache_path = os.path.join(base_dir, RESULT_CACHE_PATH)
+        self.use_cache = use_cache
+        self.loaded_module = False
+
+    def _cache_key(self):
+        return ":".join(str(os.stat(path).st_mtime_ns)
+                        for path in [self.test_file] + self.deps)
+
+    def _read_cache(self):
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (IOError, ValueError):
+            return {}
+
+    def loadTestsFromModule(self, module, *args, **kwargs):
+        self.loaded_module = True
+        if self.use_cache and self._read_cache().get(self.test_file) == self._cache_key():
+            print("{0}: unchanged since last passing run, skipped (use --no-cache to run)".format(
+                os.path.basename(self.test_file)), file=sys.stderr)
+            return self.suiteClass()
+        return super(CachedLoader, self).loadTestsFromModule(module, *args, **kwargs)
+
+    def record(self, result):
+        """
+        Record a passing whole-module run; drop the entry otherwise.
+
+        Args:
+            result: unittest.TestResult of the run
+        """
+        if not self.loaded_module:
+            return
+        cache = self._read_cache()
+        if result.wasSuccessful() and result.testsRun:
+            cache[self.test_file] = self._cache_key()
+        elif result.testsRun:
+            cache.pop(self.test_file, None)
+        else:
+            return
+        os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+        with open(self.cache_path, "w", encoding="utf-8") as f:
+            json.dump(cache, f, indent=2, sort_keys=True)
+
+
+def main(test_file, deps=()):
+    """
+    Run a test module with CachedLoader, honouring a --no-cache flag.
+
+    Args:
+        test_file: Path of the test module (pass __file__)
+        deps: Paths of the source files the test module exercises
+    """
+    argv = [arg for arg in sys.argv if arg != "--no-cache"]
+    loader = CachedLoader(test_file, deps, use_cache=len(argv) == len(sys.argv))
+    program = unittest.main(argv=argv, testLoader=loader, exit=False)
+    loader.record(program.result)
+    sys.exit(not program.result.wasSuccessful())
@@ -1,8 +1,8 @@
 #!/usr/bin/env python3
 """Highly optimized standalone version"""
-import argparse, json, sys, random, threading, re
-import itertools
-from collections import defaultdict, deque
+import argparse, json, sys, random, threading
+from collections import Counter, defaultdict, deque
+from itertools import cycle, islice
 from getpass import getpass
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
@@ -10,11 +10,11 @@ from datetime import datetime
 try:
     import pymysql
 except ImportError:
-    print("Error: PyMySQL required.  Install: pip install PyMySQL", file=sys.stderr)
-    sys.exit(1)
+    # Only needed to connect; checked in connect_mysql() so the module stays importable
+    pymysql = None
 
 from generate_synthetic_data_utils import *
-from generate_synthetic_data_patterns import unique_list, ThreadLocalCounter
+from generate_synthetic_data_patterns import unique_list, ThreadLocalCounter, LazyCartesianProduct, sample_cartesian_product
 
 def build_dependency_graph(config_tables, fk_list, composite_logical_fks=None):
     nodes = set("{0}.{1}".format(t['schema'], t['table']) for t in config_tables)
@@ -51,6 +51,9 @@ def topo_sort(nodes, edges):
     return order
 
 def connect_mysql(args):
+    if pymysql is None:
+        print("Error: PyMySQL required.  Install: pip install PyMySQL", file=sys.stderr)
+        sys.exit(1)
     pwd = args.src_password
     if args.ask_pass and not pwd:
         pwd = getpass("Password for {0}@{1}: ".format(args. src_user, args.src_host))
@@ -63,7 +66,7 @@ def connect_mysql(args):
 def load_table_columns(conn, schema, table):
     cur = conn.cursor()
     cur.execute("SELECT COLUMN_NAME, DATA_TYPE, IS_NULLABLE, COLUMN_TYPE, COLUMN_KEY, EXTRA, CHARACTER_MAXIMUM_LENGTH, NUMERIC_PRECISION, NUMERIC_SCALE, COLUMN_DEFAULT FROM information_schema. COLUMNS WHERE TABLE_SCHEMA=%s AND TABLE_NAME=%s ORDER BY ORDINAL_POSITION", (schema, table))
-    return [ColumnMeta(*r) for r in cur.fetchall()]
+    return [ColumnMeta(sys.intern(r[0]), *r[1:]) for r in cur.fetchall()]
 
 def load_table_pk(conn, schema, table):
     cur = conn.cursor()
@@ -85,13 +88,14 @@ def load_unique_constraints(conn, schema, table):
     constraints = {}
     for idx_name, col_name, seq in cur.fetchall():
         if idx_name != "PRIMARY":
-            constraints. setdefault(idx_name, []).append(col_name)
+            constraints. setdefault(idx_name, []).append(sys.intern(col_name))
     return [UniqueConstraint(n, tuple(cols)) for n, cols in constraints.items()]
 
 def load_fk_constraints_for_schema(conn, schema):
     cur = conn.cursor()
     cur.execute("SELECT CONSTRAINT_NAME, TABLE_SCHEMA, TABLE_NAME, COLUMN_NAME, REFERENCED_TABLE_SCHEMA, REFERENCED_TABLE_NAME, REFERENCED_COLUMN_NAME FROM information_schema.KEY_COLUMN_USAGE WHERE TABLE_SCHEMA=%s AND REFERENCED_TABLE_NAME IS NOT NULL", (schema,))
-    return [FKMeta(*r, is_logical=False, condition=None) for r in cur.fetchall()]
+    # Schema/table/column names repeat across FKs; intern them so they are stored once
+    return [FKMeta(*map(sys.intern, r), is_logical=False, condition=None) for r in cur.fetchall()]
 
 def sample_static_fk_values(conn, static_schema, static_table, static_column, sample_size, rng):
     cur = conn.cursor()
@@ -107,26 +111,42 @@ def sample_static_fk_values(conn, static_schema, static_table, static_column, sa
         sys.exit(1)
 
 def load_logical_fks_from_config(config):
-    single_fks, composite_fks = [], []
-    for table_cfg in config:
-        tschema, tname = table_cfg["schema"], table_cfg["table"]
-        ignore_self_refs = table_cfg.get("ignore_self_referential_fks", False)
-        for lfk in table_cfg.get("logical_fks", []):
-            if "column" in lfk:
-                cname = lfk["column"]
-                ref_schema, ref_table, ref_column = lfk["referenced_schema"], lfk["referenced_table"], lfk["referenced_column"]
-                if ignore_self_refs and ref_schema == tschema and ref_table == tname:
-                    continue
-                condition = lfk.get("condition")  # Support conditional FK
-                single_fks.append(FKMeta(lfk.get("constraint_name", "LOGICAL_{0}_{1}".format(tname, cname)), tschema, tname, cname, ref_schema, ref_table, ref_column, True, condition))
-            elif "child_columns" in lfk and "referenced_columns" in lfk:
-                child_cols, parent_cols = tuple(lfk["child_columns"]), tuple(lfk["referenced_columns"])
-                ref_schema, ref_table = lfk["referenced_schema"], lfk["referenced_table"]
-                if ignore_self_refs and ref_schema == tschema and ref_table == tname:
-                    continue
-                composite_fks.append({"constraint_name": lfk.get("constraint_name", "LOGICAL_{0}_{1}".format(tname, '_'.join(child_cols))), "table_schema": tschema, "table_name": tname, "child_columns": child_cols, "referenced_table_schema": ref_schema, "referenced_table_name": ref_table, "referenced_columns": parent_cols, "population_rate": lfk.get("population_rate"), "condition": lfk.get("condition")})
+    # Names repeat across FKs; intern them (and stripped conditions) so each is stored once
+    intern = sys.intern
+    single_fks = [
+        FKMeta(lfk["constraint_name"] if "constraint_name" in lfk else "LOGICAL_{0}_{1}".format(tname, lfk["column"]),
+               tschema, tname, intern(lfk["column"]),
+               intern(lfk["referenced_schema"]), intern(lfk["referenced_table"]), intern(lfk["referenced_column"]),
+               True, _intern_condition(lfk.get("condition")))  # Support conditional FK
+        for tschema, tname, ignore_self_refs, lfks in _iter_logical_fk_tables(config)
+        for lfk in lfks
+        if "column" in lfk
+        and not (ignore_self_refs and lfk["referenced_schema"] == tschema and lfk["referenced_table"] == tname)
+    ]
+    composite_fks = [
+        {"constraint_name": lfk["constraint_name"] if "constraint_name" in lfk else "LOGICAL_{0}_{1}".format(tname, '_'.join(lfk["child_columns"])),
+         "table_schema": tschema, "table_name": tname,
+         "child_columns": tuple(map(intern, lfk["child_columns"])),
+         "referenced_table_schema": intern(lfk["referenced_schema"]), "referenced_table_name": intern(lfk["referenced_table"]),
+         "referenced_columns": tuple(map(intern, lfk["referenced_columns"])),
+         "population_rate": lfk.get("population_rate"), "condition": _intern_condition(lfk.get("condition"))}
+        for tschema, tname, ignore_self_refs, lfks in _iter_logical_fk_tables(config)
+        for lfk in lfks
+        if "column" not in lfk and "child_columns" in lfk and "referenced_columns" in lfk
+        and not (ignore_self_refs and lfk["referenced_schema"] == tschema and lfk["referenced_table"] == tname)
+    ]
     return single_fks, composite_fks
 
+def _iter_logical_fk_tables(config):
+    for table_cfg in config:
+        lfks = table_cfg.get("logical_fks")
+        if lfks:
+            yield (sys.intern(table_cfg["schema"]), sys.intern(table_cfg["table"]),
+                   table_cfg.get("ignore_self_referential_fks", False), lfks)
+
+def _intern_condition(condition):
+    return sys.intern(condition.strip()) if condition else condition
+
 def load_config(path):
     try:
         with open(path, "r", encoding="utf-8") as f:
@@ -477,12 +497,19 @@ class FastSyntheticGenerator:
                     debug_print("{0}: Composite UNIQUE {1} will use sequential generation for uncontrolled columns: {2}".format(
                         node, uc.constraint_name, uncontrolled_cols_in_constraint))
         
+        # Specialize extended-config generators once per batch instead of re-dispatching per row
+        config_generators = {}
+        for col in tmeta.columns:
+            col_config = populate_config.get(col.name)
+            if col_config and ("values" in col_config or "min" in col_config):
+                config_generators[col.name] = compile_value_generator(col, col_config)
+        
+        col_table = build_column_meta_table(tmeta.columns)
+        
         for batch_idx in range(start_idx, end_idx):
             row = {}
             
-            for col in tmeta.columns:
-                cname = col.name
-                
+            for col, cname, dtype, nullable in zip(*col_table):
                 if cname in tmeta.pk_columns and tmeta.auto_increment and table_key not in self.forced_explicit_parents:
                     row[cname] = None
                     continue
@@ -507,8 +534,6 @@ class FastSyntheticGenerator:
                         continue
                     # else: fall through to generate value below
                 
-                dtype = (col.data_type or "").lower()
-                
                 # PRIORITY 0: Sequential generation for uncontrolled columns in composite UNIQUE constraints
                 # This prevents collisions when generating large datasets
                 if cname in cols_needing_sequential:
@@ -542,7 +567,7 @@ class FastSyntheticGenerator:
                 is_in_unique = cname in all_unique_cols
                 
                 # Check if column is in populate_columns (either simple or extended format)
-                if col.is_nullable == "YES" and not is_in_unique:
+                if nullable and not is_in_unique:
                     if populate_columns is None or cname not in populate_config:
                         continue
                 
@@ -570,11 +595,9 @@ class FastSyntheticGenerator:
                     continue
                 
                 # PRIORITY 2: Check if this column has extended configuration (but not a global pool)
-                col_config = populate_config.get(cname)
-                
-                if col_config and ("values" in col_config or "min" in col_config):
+                if cname in config_generators:
                     # Use extended configuration to generate value
-                    base_value = generate_value_with_config(thread_rng, col, col_config)
+                    base_value = config_generators[cname](thread_rng)
                     
                     # Handle unique constraint for string types with extended config
                     # Only append suffix for single-column UNIQUE, not composite UNIQUE
@@ -599,18 +622,14 @@ class FastSyntheticGenerator:
                         row[cname] = batch_idx
                         continue
                     else:
-                        base_value = thread_rng.randint(18, 80) if re.search(r"age|years? ", cname, re.I) else thread_rng.randint(0, 10000)
+                        base_value = thread_rng.randint(18, 80) if is_age_column(cname) else thread_rng.randint(0, 10000)
                 elif dtype in ("decimal", "numeric", "float", "double"):
                     prec, scale = int(col.numeric_precision or 10), int(col.numeric_scale or 0)
                     base_value = rand_decimal_str(thread_rng, prec, scale)
                 elif dtype in ("varchar", "char", "text", "mediumtext", "longtext"):
-                    lname = cname.lower()
-                    if "email" in lname:
-                        base_value = rand_email(thread_rng)
-                    elif "name" in lname:
-                        base_value = rand_name(thread_rng)
-                    elif "phone" in lname:
-                        base_value = rand_phone(thread_rng)
+                    text_generator = text_column_generator(cname)
+                    if text_generator is not None:
+                        base_value = text_generator(thread_rng)
                     else:
                         maxlen = int(col.char_max_length) if col.char_max_length else 24
                         base_value = rand_string(thread_rng, min(maxlen, 24))
@@ -629,13 +648,11 @@ class FastSyntheticGenerator:
                 elif dtype in ("date", "datetime", "timestamp"):
                     base_value = rand_datetime(thread_rng). split(" ")[0] if dtype == "date" else rand_datetime(thread_rng)
                 elif dtype == "enum":
-                    m = re.findall(r"'((?:[^']|(?:''))*)'", col.column_type or "")
-                    vals = [v.replace("''", "'") for v in m]
+                    vals = parse_enum_values(col.column_type)
                     base_value = rand_choice(thread_rng, vals)
                 elif dtype == "set":
                     # Parse SET values from column_type: SET('val1','val2','val3')
-                    m = re.findall(r"'((?:[^']|(?:''))*)'", col.column_type or "")
-                    set_values = [v.replace("''", "'") for v in m]
+                    set_values = parse_enum_values(col.column_type)
                     
                     if set_values:
                         # Generate random subset: select 0 to N values
@@ -830,10 +847,10 @@ class FastSyntheticGenerator:
                         parent_caches[fk.column_name] = parent_vals
         
         # Group conditional FKs by column for priority resolution
-        conditional_fks_by_column = defaultdict(list)
+        conditional_fks_by_column = {}
         for fk in self.fks:
             if "{0}.{1}".format(fk.table_schema, fk.table_name) == node and fk.condition:
-                conditional_fks_by_column[fk.column_name].append(fk)
+                conditional_fks_by_column.setdefault(fk.column_name, []).append(fk)
         
         # For columns with conditional FKs, combine all parent values into parent_caches
         # This enables Cartesian product generation with the full pool of possible values
@@ -849,7 +866,11 @@ class FastSyntheticGenerator:
                     parent_caches[fk_col] = unique_list(all_parent_vals)
                     debug_print("{0}: Conditional FK column {1} has {2} total unique parent values from {3} tables".format(
                         node, fk_col, len(parent_caches[fk_col]), len(fk_list)))
-        
+
+        # Index conditions once so each row is matched with a lookup per discriminator column
+        conditional_fk_indexes = {fk_col: build_fk_condition_index(fk_list)
+                                  for fk_col, fk_list in conditional_fks_by_column.items()}
+
         composite_cfgs = self.find_composite_fks_for_child(node)
         composite_columns_all = set()
         for comp in composite_cfgs:
@@ -893,8 +914,8 @@ class FastSyntheticGenerator:
                     print("  Truncating to {0} rows".format(len(unique_parent_vals)), file=sys.stderr)
                     rows = rows[:len(unique_parent_vals)]
                 
-                self.rng.shuffle(unique_parent_vals)
-                pre_allocated_pk = unique_parent_vals[:len(rows)]
+                # Draw the needed parents directly rather than shuffling them all
+                pre_allocated_pk = self.rng.sample(unique_parent_vals, len(rows))
             elif len(tmeta.pk_columns) > 1:
                 # Multi-column PK - check which PK columns are single-column FKs (not composite FKs)
                 pk_cols_that_are_single_fks = set()
@@ -954,8 +975,7 @@ class FastSyntheticGenerator:
                             for child_col, parent_col in zip(comp["child_columns"], comp["referenced_columns"]):
                                 child_col_meta = next((c for c in tmeta.columns if c.name == child_col), None)
                                 if child_col_meta and child_col_meta.data_type and child_col_meta.data_type.lower() == "enum":
-                                    m = re.findall(r"'((?:[^']|(?:''))*)'", child_col_meta.column_type or "")
-                                    valid_values = set([v.replace("''", "'") for v in m])
+                                    valid_values = set(parse_enum_values(child_col_meta.column_type))
                                     enum_validators[parent_col] = valid_values
                             
                             # Filter parent rows by enum constraints before extracting combinations
@@ -1034,6 +1054,13 @@ class FastSyntheticGenerator:
                             # Hybrid: composite FK combos × single-column FK values
                             debug_print("{0}: Generating hybrid Cartesian product".format(node), level=2)
                             
+                            # Position of each PK column in a flattened (composite combo + single values) tuple
+                            hybrid_positions = [
+                                composite_fk_pk_combo_cols.index(pk_col) if pk_col in composite_fk_pk_combo_cols
+                                else len(composite_fk_pk_combo_cols) + ordered_single_fk_pk_cols.index(pk_col)
+                                for pk_col in all_pk_cols_in_order
+                            ]
+                            
                             if needed_rows < max_combinations and max_combinations > 100000:
                                 # Random sampling for large pools
                                 debug_print("{0}: Using random sampling ({1} of {2} combinations)".format(
@@ -1056,17 +1083,8 @@ class FastSyntheticGenerator:
                                     single_combo = tuple(self.rng.choice(pool) for pool in pk_value_pools)
                                     
                                     # Merge in PK column order
-                                    full_combo = []
-                                    comp_idx, single_idx = 0, 0
-                                    for pk_col in all_pk_cols_in_order:
-                                        if pk_col in composite_fk_pk_combo_cols:
-                                            col_pos = composite_fk_pk_combo_cols.index(pk_col)
-                                            full_combo.append(comp_combo[col_pos])
-                                        elif pk_col in ordered_single_fk_pk_cols:
-                                            col_pos = ordered_single_fk_pk_cols.index(pk_col)
-                                            full_combo.append(single_combo[col_pos])
-                                    
-                                    full_combo = tuple(full_combo)
+                                    flat = comp_combo + single_combo
+                                    full_combo = tuple([flat[pos] for pos in hybrid_positions])
                                     if full_combo not in used_combos:
                                         used_combos.add(full_combo)
                                         pre_allocated_pk_tuples.append(full_combo)
@@ -1076,43 +1094,24 @@ class FastSyntheticGenerator:
                                     # Fallback to full generation
                                     debug_print("{0}: Random sampling got {1}, falling back to full generation".format(
                                         node, len(pre_allocated_pk_tuples)))
-                                    all_combinations = []
-                                    for comp_combo in composite_fk_pk_combos:
-                                        for single_combo in itertools.product(*pk_value_pools):
-                                            full_combo = []
-                                            for pk_col in all_pk_cols_in_order:
-                                                if pk_col in composite_fk_pk_combo_cols:
-                                                    col_pos = composite_fk_pk_combo_cols.index(pk_col)
-                                                    full_combo.append(comp_combo[col_pos])
-                                                elif pk_col in ordered_single_fk_pk_cols:
-                                                    col_pos = ordered_single_fk_pk_cols.index(pk_col)
-                                                    full_combo.append(single_combo[col_pos])
-                                            all_combinations.append(tuple(full_combo))
-                                    self.rng.shuffle(all_combinations)
-                                    pre_allocated_pk_tuples = all_combinations[:needed_rows]
+                                    pre_allocated_pk_tuples = None
                             else:
-                                # Full Cartesian product
-                                all_combinations = []
-                                for comp_combo in composite_fk_pk_combos:
-                                    for single_combo in itertools.product(*pk_value_pools):
-                                        full_combo = []
-                                        for pk_col in all_pk_cols_in_order:
-                                            if pk_col in composite_fk_pk_combo_cols:
-                                                col_pos = composite_fk_pk_combo_cols.index(pk_col)
-                                                full_combo.append(comp_combo[col_pos])
-                                            elif pk_col in ordered_single_fk_pk_cols:
-                                                col_pos = ordered_single_fk_pk_cols.index(pk_col)
-                                                full_combo.append(single_combo[col_pos])
-                                        all_combinations.append(tuple(full_combo))
-                                self.rng.shuffle(all_combinations)
-                                pre_allocated_pk_tuples = all_combinations[:needed_rows]
+                                pre_allocated_pk_tuples = None
+                            
+                            if pre_allocated_pk_tuples is None:
+                                # Full Cartesian product, sampled by index: each sample is
+                                # (composite combo, single value, ...), merged in PK column order
+                                pre_allocated_pk_tuples = []
+                                for combo in sample_cartesian_product(
+                                        [composite_fk_pk_combos] + pk_value_pools, needed_rows, self.rng):
+                                    flat = combo[0] + combo[1:]
+                                    pre_allocated_pk_tuples.append(tuple([flat[pos] for pos in hybrid_positions]))
                         
                         elif composite_fk_pk_combos:
                             # Only composite FK combos (no single-column FK-PK columns)
                             debug_print("{0}: Using only composite FK combinations".format(node), level=2)
                             all_pk_cols_in_order = composite_fk_pk_combo_cols
-                            self.rng.shuffle(composite_fk_pk_combos)
-                            pre_allocated_pk_tuples = composite_fk_pk_combos[:needed_rows]
+                            pre_allocated_pk_tuples = self.rng.sample(composite_fk_pk_combos, needed_rows)
                         
                         elif pk_value_pools:
                             # Only single-column FK-PK columns (original logic path)
@@ -1142,13 +1141,11 @@ class FastSyntheticGenerator:
                                 if len(pre_allocated_pk_tuples) < needed_rows:
                                     debug_print("{0}: Random sampling got {1}, falling back to full generation".format(
                                         node, len(pre_allocated_pk_tuples)))
-                                    all_combinations = list(itertools.product(*pk_value_pools))
-                                    self.rng.shuffle(all_combinations)
-                                    pre_allocated_pk_tuples = all_combinations[:needed_rows]
+                                    pre_allocated_pk_tuples = sample_cartesian_product(
+                                        pk_value_pools, needed_rows, self.rng)
                             else:
-                                all_combinations = list(itertools.product(*pk_value_pools))
-                                self.rng.shuffle(all_combinations)
-                                pre_allocated_pk_tuples = all_combinations[:needed_rows]
+                                pre_allocated_pk_tuples = sample_cartesian_product(
+                                    pk_value_pools, needed_rows, self.rng)
                         
                         # Store the column order for tuple assignment
                         pre_allocated_pk_cols = all_pk_cols_in_order
@@ -1176,50 +1173,39 @@ class FastSyntheticGenerator:
                 if "{0}.{1}".format(fk.table_schema, fk.table_name) == node:
                     fk_map[fk.column_name] = fk
             
+            # Controlled = FK column OR has explicit values/range in populate_columns;
+            # collect them once so each constraint is a single subset test
+            controlled_cols = set(fk_map)
+            if cfg:
+                populate_config = self.populate_columns_config.get(node, {})
+                controlled_cols.update(col for col, col_config in populate_config.items()
+                                       if "values" in col_config or "min" in col_config)
+            
             for uc in unique_constraints:
                 # Skip single-column UNIQUE (already handled by unique value pools)
                 if len(uc.columns) < 2:
                     continue
                 
                 # Check if ALL columns in this UNIQUE constraint are "controlled"
-                # Controlled = FK column OR has explicit values/range in populate_columns
-                all_controlled = True
-                for col in uc.columns:
-                    is_fk = col in fk_map
-                    has_explicit_config = False
-                    
-                    if cfg:
-                        populate_config = self.populate_columns_config.get(node, {})
-                        col_config = populate_config.get(col, {})
-                        has_explicit_config = "values" in col_config or "min" in col_config
-                    
-                    if not (is_fk or has_explicit_config):
-                        all_controlled = False
-                        break
-                
-                if all_controlled:
+                if controlled_cols.issuperset(uc.columns):
                     unique_fk_constraints.append(uc)
             
             # Check for overlapping UNIQUE constraints (share columns)
             overlapping_constraint_groups = []
             if len(unique_fk_constraints) > 1:
-                # Find constraints that share columns
-                for i, uc1 in enumerate(unique_fk_constraints):
-                    group = set([uc1])
-                    for j, uc2 in enumerate(unique_fk_constraints):
-                        if i != j and set(uc1.columns) & set(uc2.columns):
-                            group.add(uc2)
+                # Find constraints that share columns (column sets built once). Groups are
+                # collected as indexes in constraint order, so no constraint is rehashed
+                # and the group order does not depend on string hash randomization
+                uc_col_sets = [frozenset(uc.columns) for uc in unique_fk_constraints]
+                seen_groups = set()
+                for i, cols1 in enumerate(uc_col_sets):
+                    group = tuple(j for j, cols2 in enumerate(uc_col_sets)
+                                  if j == i or not cols1.isdisjoint(cols2))
                     
-                    if len(group) > 1:
-                        overlapping_constraint_groups.append(list(group))
-                
-                # Deduplicate groups
-                unique_groups = []
-                for group in overlapping_constraint_groups:
-                    group_set = frozenset(uc.constraint_name for uc in group)
-                    if not any(group_set == frozenset(uc.constraint_name for uc in g) for g in unique_groups):
-                        unique_groups.append(group)
-                overlapping_constraint_groups = unique_groups
+                    if len(group) > 1 and group not in seen_groups:
+                        # Deduplicate groups, keeping the first of each
+                        seen_groups.add(group)
+                        overlapping_constraint_groups.append([unique_fk_constraints[j] for j in group])
             
             # If we have overlapping constraints, use multi-constraint Cartesian product
             if overlapping_constraint_groups:
@@ -1232,7 +1218,7 @@ class FastSyntheticGenerator:
                 # Find shared columns
                 shared_cols = set(constraint_group[0].columns)
                 for uc in constraint_group[1:]:
-                    shared_cols &= set(uc.columns)
+                    shared_cols.intersection_update(uc.columns)
                 
                 debug_print("{0}: Shared columns: {1}".format(node, list(shared_cols)), level=2)
                 
@@ -1299,7 +1285,11 @@ class FastSyntheticGenerator:
                         print("ERROR: {0}: No values found for shared column {1}".format(node, primary_shared_col), file=sys.stderr)
                 
                 # Generate valid combinations using Cartesian product
-                all_combinations = []
+                # The product is indexed lazily: the shared value is the outer factor, so
+                # index order matches nested loops over shared values and non-shared combos
+                all_combinations = LazyCartesianProduct([])
+                non_shared_product = LazyCartesianProduct([])
+                combination_cols = []
                 
                 if shared_values and non_shared_value_lists:
                     # Get list of non-shared columns and their value lists
@@ -1310,43 +1300,34 @@ class FastSyntheticGenerator:
                     if any(not vlist for vlist in value_lists):
                         print("WARNING: {0}: Some non-shared columns have empty value lists".format(node), file=sys.stderr)
                     else:
-                        # Generate Cartesian product for each shared value
-                        for shared_val in shared_values:
-                            # Cartesian product of all non-shared column values
-                            for combo in itertools.product(*value_lists):
-                                row_assignment = {primary_shared_col: shared_val}
-                                
-                                # Assign non-shared column values
-                                for col_name, value in zip(non_shared_cols, combo):
-                                    row_assignment[col_name] = value
-                                
-                                # Verify this combination satisfies all constraints
-                                # (all required columns are present)
-                                if all(col in row_assignment for uc in constraint_group for col in uc.columns):
-                                    all_combinations.append(row_assignment)
+                        combination_cols = [primary_shared_col] + non_shared_cols
+                        
+                        # Every combination assigns the same columns, so it satisfies all
+                        # constraints (all required columns are present) or none of them
+                        if all(col in combination_cols for uc in constraint_group for col in uc.columns):
+                            all_combinations = LazyCartesianProduct([shared_values] + value_lists)
+                            non_shared_product = LazyCartesianProduct(value_lists)
                 
-                debug_print("{0}: Generated {1} total valid combinations".format(node, len(all_combinations)), level=1)
+                debug_print("{0}: Generated {1} total valid combinations".format(node, all_combinations.size), level=1)
                 
                 # Check if we have enough combinations
-                if len(all_combinations) < len(rows):
+                if all_combinations.size < len(rows):
                     print("WARNING: {0} only has {1} unique combinations for overlapping constraints but {2} rows requested. Will generate duplicates.".format(
-                        node, len(all_combinations), len(rows)), file=sys.stderr)
-                    # Repeat combinations to reach total_rows using modulo for memory efficiency
-                    extended_combinations = []
-                    for i in range(len(rows)):
-                        extended_combinations.append(all_combinations[i % len(all_combinations)])
-                    all_combinations = extended_combinations
-                    # Use all extended combinations directly (no stratification needed when repeating)
-                    selected_combinations = all_combinations
+                        node, all_combinations.size, len(rows)), file=sys.stderr)
+                    # Repeat combinations in product order to reach total_rows (no stratification needed when repeating)
+                    selected_combinations = list(islice(cycle(all_combinations), len(rows)))
                 else:
                     # Use STRATIFIED sampling to ensure balanced distribution across shared values
                     # This guarantees all shared values (e.g., A_IDs) appear the correct number of times
                     
-                    # Group combinations by shared value (e.g., A_ID)
-                    combos_by_shared_val = defaultdict(list)
-                    for combo in all_combinations:
-                        shared_val = combo[primary_shared_col]
-                        combos_by_shared_val[shared_val].append(combo)
+                    # Each shared value (e.g., A_ID) pairs with the whole non-shared product,
+                    # once per occurrence of the value in shared_values
+                    shared_val_counts = defaultdict(int)
+                    for shared_val in shared_values:
+                        shared_val_counts[shared_val] += 1
+                    
+                    # Positions of the non-shared columns within a non-shared combination
+                    col_pos = {col_name: i for i, col_name in enumerate(combination_cols[1:])}
                     
                     # Calculate how many rows each shared value should get
                     rows_per_shared_val = len(rows) // len(shared_values)
@@ -1363,14 +1344,25 @@ class FastSyntheticGenerator:
                             if col not in shared_cols and col not in constraint_non_shared_cols:
                                 constraint_non_shared_cols.append(col)
                     
+                    # Combination positions of the columns after the first, the ones checked for reuse
+                    diversity_positions = [col_pos[col] for col in constraint_non_shared_cols[1:]]
+                    
+                    # Non-shared combinations grouped by first constraint column (built on first use).
+                    # Each group is itself a Cartesian product: the other factors with the first
+                    # column pinned to one value, so it is indexed lazily like the full product
+                    by_first_col = None
+                    
+                    # Smart-selection picks per chosen order of first-column values
+                    smart_picks = {}
+                    
                     selected_combinations = []
                     shared_values_list = list(shared_values)
                     self.rng.shuffle(shared_values_list)  # Randomize order of shared values
                     
                     for idx, shared_val in enumerate(shared_values_list):
-                        available = combos_by_shared_val[shared_val]
+                        available_size = shared_val_counts[shared_val] * non_shared_product.size
                         
-                        if not available:
+                        if not available_size:
                             print("WARNING: {0}: No combinations available for shared value {1}={2}".format(
                                 node, primary_shared_col, shared_val), file=sys.stderr)
                             continue
@@ -1387,9 +1379,16 @@ class FastSyntheticGenerator:
                         if num_rows_for_this_val > 1 and num_rows_for_this_val <= 10 and len(constraint_non_shared_cols) >= 1:
                             # Try to ensure diversity in the first constraint column
                             first_col = constraint_non_shared_cols[0]
-                            by_first_col = defaultdict(list)
-                            for combo in available:
-                                by_first_col[combo[first_col]].append(combo)
+                            if by_first_col is None:
+                                # The grouping is the same for every shared value, so build it once
+                                first_pos = col_pos[first_col]
+                                factors = non_shared_product.factors
+                                first_val_counts = Counter(factors[first_pos])
+                                by_first_col = {}
+                                for first_val in dict.fromkeys(factors[first_pos]):
+                                    by_first_col[first_val] = LazyCartesianProduct(
+                                        factors[:first_pos] + [[first_val] * first_val_counts[first_val]] +
+                                        factors[first_pos + 1:])
                             
                             first_col_values = list(by_first_col.keys())
                             
@@ -1397,48 +1396,65 @@ class FastSyntheticGenerator:
                             if len(first_col_values) >= num_rows_for_this_val:
                                 self.rng.shuffle(first_col_values)
                                 
-                                # Now ensure diversity in other constraint columns too
-                                used_values = defaultdict(set)  # Track used values for each column
-                                
-                                for first_val in first_col_values[:num_rows_for_this_val]:
-                                    candidates = by_first_col[first_val]
+                                # The picks depend only on the order of the chosen first-column
+                                # values (the groups are fixed and the used values start empty),
+                                # so each order is resolved once and reused for later shared values
+                                chosen_first_vals = tuple(first_col_values[:num_rows_for_this_val])
+                                picks = smart_picks.get(chosen_first_vals)
+                                if picks is None:
+                                    picks = []
+                                    # Now ensure diversity in other constraint columns too
+                                    # (position, used values) for each column after the first
+                                    used_values = [(pos, set()) for pos in diversity_positions]
                                     
-                                    # Filter candidates to maximize diversity in other columns
-                                    best_candidate = None
-                                    for candidate in candidates:
-                                        # Check if this candidate adds diversity
-                                        conflicts = 0
-                                        for col in constraint_non_shared_cols[1:]:
-                                            if candidate[col] in used_values[col]:
-                                                conflicts += 1
+                                    for first_val in chosen_first_vals:
+                                        candidates = by_first_col[first_val]
                                         
-                                        if conflicts == 0 or best_candidate is None:
-                                            best_candidate = candidate
-                                            if conflicts == 0:
-                                                break  # Found a perfect candidate
-                                    
-                                    if best_candidate is None:
-                                        best_candidate = candidates[self.rng.randint(0, len(candidates) - 1)]
-                                    
-                                    selected.append(best_candidate)
+                                        # Filter candidates to maximize diversity in other columns
+                                        best_candidate = None
+                                        for candidate in candidates:
+                                            # Check if this candidate adds diversity; only zero vs.
+                                            # non-zero conflicts matters, so stop at the first one
+                                            conflicts = 0
+                                            for pos, used in used_values:
+                                                if candidate[pos] in used:
+                                                    conflicts += 1
+                                                    break
+                                            
+                                            if conflicts == 0 or best_candidate is None:
+                                                best_candidate = candidate
+                                                if conflicts == 0:
+                                                    break  # Found a perfect candidate
+                                        
+                                        if best_candidate is None:
+                                            best_candidate = candidates[self.rng.randint(0, len(candidates) - 1)]
+                                        
+                                        picks.append(best_candidate)
+                                        
+                                        # Mark values as used
+                                        for pos, used in used_values:
+                                            used.add(best_candidate[pos])
                                     
-                                    # Mark values as used
-                                    for col in constraint_non_shared_cols:
-                                        used_values[col].add(best_candidate[col])
+                                    smart_picks[chosen_first_vals] = picks
+                                
+                                for best_candidate in picks:
+                                    selected.append((shared_val,) + best_candidate)
                                 
                                 smart_selection_succeeded = True
                         
                         # If smart selection didn't work, fall back to random selection
+                        # of distinct combination indexes (the product is never shuffled whole)
                         if not smart_selection_succeeded:
-                            self.rng.shuffle(available)
-                            selected = available[:num_rows_for_this_val]
+                            sampled = self.rng.sample(range(available_size), min(num_rows_for_this_val, available_size))
+                            for combo in non_shared_product.take([i % non_shared_product.size for i in sampled]):
+                                selected.append((shared_val,) + combo)
                         
                         selected_combinations.extend(selected)
                         
                         # Safety check
                         if len(selected) < num_rows_for_this_val:
                             print("WARNING: {0}: Shared value {1}={2} only has {3} combinations but needs {4}".format(
-                                node, primary_shared_col, shared_val, len(available), num_rows_for_this_val), file=sys.stderr)
+                                node, primary_shared_col, shared_val, available_size, num_rows_for_this_val), file=sys.stderr)
                     
                     # Shuffle final selection for randomness
                     self.rng.shuffle(selected_combinations)
@@ -1446,12 +1462,10 @@ class FastSyntheticGenerator:
                     debug_print("{0}: Stratified sampling selected {1} combinations from {2} shared values".format(
                         node, len(selected_combinations), len(shared_values)))
                 
-                # Store in pre_allocated_unique_fk_tuples
-                for row_idx, combination in enumerate(selected_combinations):
-                    for col_name, value in combination.items():
-                        if col_name not in pre_allocated_unique_fk_tuples:
-                            pre_allocated_unique_fk_tuples[col_name] = {}
-                        pre_allocated_unique_fk_tuples[col_name][row_idx] = value
+                # Store in pre_allocated_unique_fk_tuples: combinations stay positional
+                # tuples and are transposed once into one row_idx -> value map per column
+                for col_name, values in zip(combination_cols, zip(*selected_combinations)):
+                    pre_allocated_unique_fk_tuples.setdefault(col_name, {}).update(enumerate(values))
                 
                 debug_print("{0}: Pre-allocated {1} rows satisfying {2} constraints".format(
                     node, len(selected_combinations), len(constraint_group)))
@@ -1475,9 +1489,10 @@ class FastSyntheticGenerator:
                                 if parent_node in self.generated_rows:
                                     parent_rows = self.generated_rows[parent_node]
                                     parent_col = fk.referenced_column_name
-                                    parent_vals = [r.get(parent_col) for r in parent_rows if r and r.get(parent_col) is not None]
-                                    unique_vals = len(set(parent_vals))
-                                    combo_count *= unique_vals
+                                    # Only the distinct count is needed, so collect straight into a set
+                                    parent_vals = {r.get(parent_col) for r in parent_rows if r}
+                                    parent_vals.discard(None)
+                                    combo_count *= len(parent_vals)
                                 else:
                                     # Parent not generated yet - can't calculate, mark as unknown (infinity)
                                     combo_count = float('inf')
@@ -1607,31 +1622,25 @@ class FastSyntheticGenerator:
                 # Only proceed if we have all parent values
                 if all_parents_loaded and len(parent_value_lists) == len(uc.columns):
                     # Generate Cartesian product
-                    all_combinations = list(itertools.product(*parent_value_lists))
+                    all_combinations = LazyCartesianProduct(parent_value_lists)
                     
                     debug_print("{0}: Generated {1} total combinations from Cartesian product".format(
-                        node, len(all_combinations)))
+                        node, all_combinations.size))
                     
                     # Check if we have enough combinations
-                    if len(all_combinations) < len(rows):
+                    if all_combinations.size < len(rows):
                         print("WARNING: {0} only has {1} unique FK combinations but {2} rows requested. Will generate duplicates.".format(
-                            node, len(all_combinations), len(rows)), file=sys.stderr)
-                        # Repeat combinations to reach total_rows using modulo for memory efficiency
-                        extended_combinations = []
-                        for i in range(len(rows)):
-                            extended_combinations.append(all_combinations[i % len(all_combinations)])
-                        all_combinations = extended_combinations
+                            node, all_combinations.size, len(rows)), file=sys.stderr)
+                        # Repeat combinations cyclically to reach total_rows
+                        all_combinations = list(islice(cycle(all_combinations), len(rows)))
                     else:
                         # Sample random subset of combinations
-                        self.rng.shuffle(all_combinations)
-                        all_combinations = all_combinations[:len(rows)]
+                        all_combinations = sample_cartesian_product(
+                            parent_value_lists, len(rows), self.rng)
                     
-                    # Pre-allocate the FK tuples for these rows
-                    for i, combo in enumerate(all_combinations):
-                        for j, col_name in enumerate(parent_col_names):
-                            if col_name not in pre_allocated_unique_fk_tuples:
-                                pre_allocated_unique_fk_tuples[col_name] = {}
-                            pre_allocated_unique_fk_tuples[col_name][i] = combo[j]
+                    # Pre-allocate the FK tuples for these rows, one column at a time
+                    for col_name, values in zip(parent_col_names, zip(*all_combinations)):
+                        pre_allocated_unique_fk_tuples.setdefault(col_name, {}).update(enumerate(values))
                     
                     debug_print("{0}: Pre-allocated {1} unique FK tuples for UNIQUE constraint {2}".format(
                         node, len(all_combinations), uc.constraint_name))
@@ -1656,8 +1665,7 @@ class FastSyntheticGenerator:
                 for child_col, parent_col in zip(fk_child_cols, parent_cols):
                     child_col_meta = next((c for c in tmeta. columns if c.name == child_col), None)
                     if child_col_meta and child_col_meta.data_type and child_col_meta.data_type. lower() == "enum":
-                        m = re.findall(r"'((?:[^']|(?:''))*)'", child_col_meta.column_type or "")
-                        valid_values = set([v.replace("''", "'") for v in m])
+                        valid_values = set(parse_enum_values(child_col_meta.column_type))
                         enum_validators[parent_col] = valid_values
                 
                 if enum_validators:
@@ -1847,21 +1855,21 @@ class FastSyntheticGenerator:
                     continue
                 
                 # Find the first FK whose condition matches
-                for fk in fk_list:
-                    if evaluate_fk_condition(fk.condition, temp_row):
-                        parent_vals = conditional_fk_caches.get(fk.constraint_name, [])
-                        if parent_vals:
-                            temp_row[fk_col] = self.rng.choice(parent_vals)
-                            assigned_by_conditional_fk.add(fk_col)
-                            debug_print("{0}: Conditional FK {1} matched (condition: {2}), assigned {3}={4}".format(
-                                node, fk.constraint_name, fk.condition, fk_col, temp_row[fk_col]))
-                            break  # Found matching FK, stop checking others for this column
-                        else:
-                            debug_print("{0}: Conditional FK {1} matched but no parent values available".format(
-                                node, fk.constraint_name))
+                for pos in match_fk_conditions(conditional_fk_indexes[fk_col], temp_row):
+                    fk = fk_list[pos]
+                    parent_vals = conditional_fk_caches.get(fk.constraint_name, [])
+                    if parent_vals:
+                        temp_row[fk_col] = self.rng.choice(parent_vals)
+                        assigned_by_conditional_fk.add(fk_col)
+                        debug_print("{0}: Conditional FK {1} matched (condition: {2}), assigned {3}={4}".format(
+                            node, fk.constraint_name, fk.condition, fk_col, temp_row[fk_col]))
+                        break  # Found matching FK, stop checking others for this column
                     else:
-                        debug_print("{0}: Skipping FK {1} - condition not met ({2})".format(
-                            node, fk.constraint_name, fk.condition))
+                        debug_print("{0}: Conditional FK {1} matched but no parent values available".format(
+                            node, fk.constraint_name))
+                else:
+                    debug_print("{0}: No conditional FK assigned for column {1} - no condition met with parent values".format(
+                        node, fk_col))
             
             # Then, resolve unconditional FKs (skip columns already handled by conditional FKs)
             for fk in self.fks:
@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 """Utility functions and data structures for synthetic data generation"""
-import hashlib, hmac, re, random, sys
-from datetime import datetime, timedelta
+import functools, hashlib, hmac, re, random, sys
+from datetime import date, datetime, timedelta
 from collections import namedtuple
 from generate_synthetic_data_patterns import CompiledPatterns
 
@@ -17,15 +17,32 @@ DEBUG_LEVEL_MEDIUM = 2    # Medium detail (constraint analysis, FK processing)
 DEBUG_LEVEL_VERBOSE = 3   # Full verbose output (individual operations, pool usage)
 
 
+# datetime.fromisoformat() is Python 3.7+
+_fromisoformat = getattr(datetime, "fromisoformat", None)
+
+@functools.lru_cache(maxsize=512)
 def parse_date(date_str):
     """
     Parse date string in various formats.
     Supports: YYYY-MM-DD, YYYY-MM-DD HH:MM:SS, ISO format
     
+    Results are cached, so validating and generating from the same config
+    bounds parses each string once.
+    
     Returns: datetime object or None if parsing fails
     """
     if not date_str:
         return None
+    # Fast path for the exact supported layouts; fromisoformat() is ~10x faster
+    # than strptime() but (3.11+) also accepts ISO forms we don't, so check shape first
+    if _fromisoformat is not None and (
+            (len(date_str) == 10 and date_str[4] == date_str[7] == "-") or
+            (len(date_str) == 19 and date_str[4] == date_str[7] == "-" and
+             date_str[10] in " T" and date_str[13] == date_str[16] == ":")):
+        try:
+            return _fromisoformat(date_str)
+        except ValueError:
+            pass
     formats = [
         "%Y-%m-%d",
         "%Y-%m-%d %H:%M:%S",
@@ -39,16 +56,32 @@ def parse_date(date_str):
     return None
 
 
+# Parsed populate_columns per table config: id(table_cfg) -> (table_cfg, items, len(items), parsed)
+_POPULATE_CONFIG_CACHE = {}
+_POPULATE_CONFIG_CACHE_LIMIT = 1024
+
+
 def parse_populate_columns_config(table_cfg):
     """
     Parse populate_columns configuration supporting both formats:
     - String: "column_name" (backward compatible)
     - Object: {"column": "name", "min": X, "max": Y} or {"column": "name", "values": [...]}
     
+    Results are cached per table config, so validating and then generating
+    from the same config parses it once. The cached dict is shared and must
+    not be modified by callers; replacing populate_columns or changing its
+    length invalidates the entry, editing its items in place does not.
+    
     Returns: dict mapping column_name -> config_object
     """
+    items = table_cfg.get("populate_columns", [])
+    cached = _POPULATE_CONFIG_CACHE.get(id(table_cfg))
+    # The entry holds table_cfg itself, so its id cannot be reused while cached
+    if cached is not None and cached[0] is table_cfg and cached[1] is items and cached[2] == len(items):
+        return cached[3]
+    
     populate_cols = {}
-    for item in table_cfg.get("populate_columns", []):
+    for item in items:
         if isinstance(item, str):
             # Backward compatible: simple column name
             populate_cols[item] = {"column": item}
@@ -59,6 +92,10 @@ def parse_populate_columns_config(table_cfg):
                 populate_cols[col_name] = item
             else:
                 print("WARNING: populate_columns entry missing 'column' field: {0}".format(item), file=sys.stderr)
+    
+    if len(_POPULATE_CONFIG_CACHE) >= _POPULATE_CONFIG_CACHE_LIMIT:
+        _POPULATE_CONFIG_CACHE.clear()
+    _POPULATE_CONFIG_CACHE[id(table_cfg)] = (table_cfg, items, len(items), populate_cols)
     return populate_cols
 
 
@@ -87,8 +124,9 @@ def validate_populate_column_config(col_meta, config):
         if "{" not in format_str or "}" not in format_str:
             print("WARNING: format string '{0}' for column {1} has no placeholders".format(
                 format_str, col_meta.name), file=sys.stderr)
-        else:
-            # Test the format string with a sample value
+        elif compile_int_format(format_str) is None:
+            # Test the format string with a sample value (simple integer
+            # patterns are known to be valid and are cached for generation)
             try:
                 format_str.format(1)
             except (ValueError, KeyError, IndexError) as e:
@@ -137,20 +175,31 @@ def validate_populate_column_config(col_meta, config):
     
     return True
 
-def debug_print(*args, level=1, **kwargs):
+def debug_enabled(level=1):
     """
-    Print debug message with timestamp if debug level is sufficient.
+    Check whether debug output at the given level is enabled.
+    
+    Lets hot paths skip building debug messages that would not be printed.
     
     Args:
-        *args: Message arguments to print
         level: Minimum debug level required (1=high, 2=medium, 3=verbose)
-        **kwargs: Additional arguments passed to print()
     """
     # Support legacy boolean debug flag
     if GLOBALS["debug"] and GLOBALS.get("debug_level", 0) == 0:
         GLOBALS["debug_level"] = 1
     
-    if GLOBALS.get("debug_level", 0) >= level:
+    return GLOBALS.get("debug_level", 0) >= level
+
+def debug_print(*args, level=1, **kwargs):
+    """
+    Print debug message with timestamp if debug level is sufficient.
+    
+    Args:
+        *args: Message arguments to print
+        level: Minimum debug level required (1=high, 2=medium, 3=verbose)
+        **kwargs: Additional arguments passed to print()
+    """
+    if debug_enabled(level):
         # Add timestamp with milliseconds
         timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
         print("[DEBUG {0}]".format(timestamp), *args, **kwargs)
@@ -186,7 +235,7 @@ def rand_decimal_str(rng, precision, scale):
     return str(whole_part)
 
 def rand_string(rng, length=12):
-    return "".join(rng.choice("abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789") for _ in range(length))
+    return "".join(rng.choices("abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789", k=length))
 
 def rand_name(rng):
     firsts = ["Alice","Bob","Charlie","Dana","Eve","Frank","Grace","Heidi","Ivan","Judy"]
@@ -210,8 +259,113 @@ def rand_datetime(rng, start_year=2010, end_year=None):
     end = datetime(end_year,12,31,23,59,59)
     delta = end - start
     secs = rng.randint(0, int(delta.total_seconds()))
-    return (start + timedelta(seconds=secs)).strftime("%Y-%m-%d %H:%M:%S")
+    # isoformat() matches "%Y-%m-%d %H:%M:%S" here (whole seconds) without strftime's parsing
+    return (start + timedelta(seconds=secs)).isoformat(" ")
+
+
+
+@functools.lru_cache(maxsize=1024)
+def parse_enum_values(column_type):
+    """
+    Parse the member list of an ENUM/SET column type (cached per type).
+    
+    Args:
+        column_type: COLUMN_TYPE string, e.g. "enum('a','b','it''s')"
+    
+    Returns: Tuple of unescaped member strings, in definition order
+    """
+    return tuple(v.replace("''", "'") for v in CompiledPatterns.ENUM_PATTERN.findall(column_type or ""))
+
+# Name-based text generators, checked in priority order (first substring wins)
+TEXT_COLUMN_GENERATORS = (
+    ("email", rand_email),
+    ("name", rand_name),
+    ("phone", rand_phone),
+)
+
+
+@functools.lru_cache(maxsize=1024)
+def text_column_generator(col_name):
+    """
+    Pick the name-based generator for a text column (cached per name).
+
+    Args:
+        col_name: Column name
+
+    Returns:
+        rand_email/rand_name/rand_phone, or None for generic strings
+    """
+    lname = col_name.lower()
+    for keyword, generator in TEXT_COLUMN_GENERATORS:
+        if keyword in lname:
+            return generator
+    return None
+
+
+@functools.lru_cache(maxsize=1024)
+def is_age_column(col_name):
+    """Check whether an integer column holds an age (cached per name)."""
+    return CompiledPatterns.AGE_PATTERN.search(col_name) is not None
+
+
+@functools.lru_cache(maxsize=256)
+def compile_int_format(format_str):
+    """
+    Translate a simple single-integer str.format() pattern to %-formatting.
+    
+    Patterns like "USER_{:08d}", "{0:x}" or "ID-{}" render integers the
+    same way with the equivalent printf-style string, which skips the
+    str.format() parser on every call.
+    
+    Args:
+        format_str: Format string from a populate_columns config
+    
+    Returns: Callable taking an int and returning the formatted string,
+             or None if the pattern needs str.format()
+    """
+    m = CompiledPatterns.SIMPLE_INT_FORMAT_PATTERN.match(format_str)
+    if not m:
+        return None
+    prefix, zero, width, type_char, suffix = m.groups()
+    printf_str = "{0}%{1}{2}{3}{4}".format(
+        prefix.replace("%", "%%"), zero or "", width or "", type_char or "d",
+        suffix.replace("%", "%%"))
+    return printf_str.__mod__
+
 
+@functools.lru_cache(maxsize=256)
+def _parse_date_range(min_str, max_str):
+    """
+    Parse a populate_columns date range once per distinct (min, max) pair.
+    
+    Returns: Tuple of (min_ordinal, min_seconds, span_days) where min_seconds
+             is the time of day of min in seconds, or None if either bound
+             is invalid
+    """
+    min_date, max_date = parse_date(min_str), parse_date(max_str)
+    if not min_date or not max_date:
+        return None
+    min_seconds = min_date.hour * 3600 + min_date.minute * 60 + min_date.second
+    return min_date.toordinal(), min_seconds, max(0, (max_date - min_date).days)
+
+def _random_date_in_range(rng, date_range, date_only):
+    """
+    Draw a random date/datetime string from a range parsed by _parse_date_range().
+    
+    Uses integer day/second arithmetic; only the final date object is allocated
+    and its C-level isoformat() renders the date part.
+    """
+    min_ordinal, min_seconds, span_days = date_range
+    ordinal = min_ordinal + rng.randint(0, span_days)
+    
+    if date_only:
+        return date.fromordinal(ordinal).isoformat()
+    
+    # Add random time component
+    extra_days, seconds = divmod(min_seconds + rng.randint(0, 86399), 86400)
+    minutes, seconds = divmod(seconds, 60)
+    return "%s %02d:%02d:%02d" % (
+        date.fromordinal(ordinal + extra_days).isoformat(), minutes // 60, minutes % 60, seconds)
 
 def generate_value_with_config(rng, col, config=None):
     """
@@ -231,7 +385,8 @@ def generate_value_with_config(rng, col, config=None):
     
     # Check if specific values are provided
     if "values" in config:
-        debug_print("Column {0}: Using values list {1}".format(col.name, config["values"]))
+        if debug_enabled():
+            debug_print("Column {0}: Using values list {1}".format(col.name, config["values"]))
         return rng.choice(config["values"])
     
     # Check for min/max range
@@ -242,17 +397,19 @@ def generate_value_with_config(rng, col, config=None):
     # Handle integer types with ranges
     if "int" in dtype or dtype in ("bigint", "smallint", "mediumint", "tinyint"):
         if has_range:
-            debug_print("Column {0}: Using int range [{1}, {2}]".format(col.name, min_val, max_val))
+            if debug_enabled():
+                debug_print("Column {0}: Using int range [{1}, {2}]".format(col.name, min_val, max_val))
             return rng.randint(int(min_val), int(max_val))
         # Default integer generation
-        if CompiledPatterns.AGE_PATTERN.search(col.name):
+        if is_age_column(col.name):
             return rng.randint(18, 80)
         return rng.randint(0, 10000)
     
     # Handle decimal/float types with ranges
     elif dtype in ("decimal", "numeric", "float", "double", "real"):
         if has_range:
-            debug_print("Column {0}: Using decimal range [{1}, {2}]".format(col.name, min_val, max_val))
+            if debug_enabled():
+                debug_print("Column {0}: Using decimal range [{1}, {2}]".format(col.name, min_val, max_val))
             return round(rng.uniform(float(min_val), float(max_val)), 2)
         # Default decimal generation
         prec = int(col.numeric_precision or 10)
@@ -262,21 +419,11 @@ def generate_value_with_config(rng, col, config=None):
     # Handle date/datetime/timestamp types with ranges
     elif dtype in ("date", "datetime", "timestamp"):
         if has_range:
-            min_date = parse_date(str(min_val))
-            max_date = parse_date(str(max_val))
-            if min_date and max_date:
-                debug_print("Column {0}: Using date range [{1}, {2}]".format(col.name, min_val, max_val))
-                delta = max_date - min_date
-                random_days = rng.randint(0, max(0, delta.days))
-                random_date = min_date + timedelta(days=random_days)
-                
-                if dtype == "date":
-                    return random_date.strftime("%Y-%m-%d")
-                else:  # datetime/timestamp
-                    # Add random time component
-                    random_seconds = rng.randint(0, 86399)
-                    random_datetime = random_date + timedelta(seconds=random_seconds)
-                    return random_datetime.strftime("%Y-%m-%d %H:%M:%S")
+            date_range = _parse_date_range(str(min_val), str(max_val))
+            if date_range:
+                if debug_enabled():
+                    debug_print("Column {0}: Using date range [{1}, {2}]".format(col.name, min_val, max_val))
+                return _random_date_in_range(rng, date_range, dtype == "date")
         # Default date generation
         return rand_datetime(rng).split(" ")[0] if dtype == "date" else rand_datetime(rng)
     
@@ -289,6 +436,10 @@ def generate_value_with_config(rng, col, config=None):
             # Apply format if provided
             if "format" in config:
                 format_str = config["format"]
+                int_format = compile_int_format(format_str)
+                if int_format is not None:
+                    maxlen = int(col.char_max_length) if col.char_max_length else 255
+                    return int_format(base_value)[:maxlen]
                 try:
                     formatted_value = format_str.format(base_value)
                     # Truncate to column max length
@@ -303,28 +454,21 @@ def generate_value_with_config(rng, col, config=None):
             # No format specified, return as string
             return str(base_value)
         
-        lname = col.name.lower()
-        if "email" in lname:
-            return rand_email(rng)
-        elif "name" in lname:
-            return rand_name(rng)
-        elif "phone" in lname:
-            return rand_phone(rng)
-        else:
-            maxlen = int(col.char_max_length) if col.char_max_length else 24
-            return rand_string(rng, min(maxlen, 24))
+        text_generator = text_column_generator(col.name)
+        if text_generator is not None:
+            return text_generator(rng)
+        maxlen = int(col.char_max_length) if col.char_max_length else 24
+        return rand_string(rng, min(maxlen, 24))
     
     # Handle enum types
     elif dtype == "enum":
-        m = CompiledPatterns.ENUM_PATTERN.findall(col.column_type or "")
-        vals = [v.replace("''", "'") for v in m]
+        vals = parse_enum_values(col.column_type)
         return rng.choice(vals) if vals else None
     
     # Handle set types
     elif dtype == "set":
         # Parse SET values from column_type: SET('val1','val2','val3')
-        m = CompiledPatterns.ENUM_PATTERN.findall(col.column_type or "")
-        set_values = [v.replace("''", "'") for v in m]
+        set_values = parse_enum_values(col.column_type)
         
         if set_values:
             # Generate random subset: select 0 to N values
@@ -352,21 +496,143 @@ def generate_value_with_config(rng, col, config=None):
     return None
 
 
+def compile_value_generator(col, config):
+    """
+    Specialize generate_value_with_config() for one column and config.
+    
+    The data type and config keys are inspected once; the returned callable
+    only draws from the RNG. It consumes the RNG exactly like
+    generate_value_with_config(), so output for a given seed is unchanged.
+    Configurations without a specialized form fall back to the generic path.
+    
+    Args:
+        col: ColumnMeta object
+        config: Dict with 'min', 'max', 'values', or 'format' keys
+    
+    Returns: Callable taking an RNG and returning a generated value
+    """
+    if not config:
+        return lambda rng: generate_value_with_config(rng, col, config)
+    
+    if "values" in config:
+        values = config["values"]
+        debug_print("Column {0}: Using values list {1}".format(col.name, values))
+        return lambda rng: rng.choice(values)
+    
+    dtype = (col.data_type or "").lower()
+    min_val = config.get("min")
+    max_val = config.get("max")
+    if min_val is None or max_val is None:
+        return lambda rng: generate_value_with_config(rng, col, config)
+    
+    if "int" in dtype or dtype in ("bigint", "smallint", "mediumint", "tinyint"):
+        lo, hi = int(min_val), int(max_val)
+        debug_print("Column {0}: Using int range [{1}, {2}]".format(col.name, lo, hi))
+        return lambda rng: rng.randint(lo, hi)
+    
+    if dtype in ("decimal", "numeric", "float", "double", "real"):
+        lo, hi = float(min_val), float(max_val)
+        debug_print("Column {0}: Using decimal range [{1}, {2}]".format(col.name, lo, hi))
+        # Same arithmetic as rng.uniform(lo, hi), with the span computed once
+        span = hi - lo
+        return lambda rng: round(lo + span * rng.random(), 2)
+    
+    if dtype in ("varchar", "char", "text", "mediumtext", "longtext"):
+        lo, hi = int(min_val), int(max_val)
+        if "format" not in config:
+            return lambda rng: str(rng.randint(lo, hi))
+        format_str = config["format"]
+        maxlen = int(col.char_max_length) if col.char_max_length else 255
+        int_format = compile_int_format(format_str)
+        if int_format is not None:
+            # Output length grows with |n|, so the range ends bound every value's length
+            if max(len(int_format(lo)), len(int_format(hi))) <= maxlen:
+                return lambda rng: int_format(rng.randint(lo, hi))
+            return lambda rng: int_format(rng.randint(lo, hi))[:maxlen]
+        
+        def generate_formatted(rng):
+            base_value = rng.randint(lo, hi)
+            try:
+                return format_str.format(base_value)[:maxlen]
+            except (ValueError, KeyError, IndexError) as e:
+                print("WARNING: Format string '{0}' failed for column {1}: {2}. Using plain value.".format(
+                    format_str, col.name, e), file=sys.stderr)
+                return str(base_value)
+        return generate_formatted
+    
+    if dtype in ("date", "datetime", "timestamp"):
+        date_range = _parse_date_range(str(min_val), str(max_val))
+        if date_range:
+            debug_print("Column {0}: Using date range [{1}, {2}]".format(col.name, min_val, max_val))
+            date_only = dtype == "date"
+            return lambda rng: _random_date_in_range(rng, date_range, date_only)
+    
+    return lambda rng: generate_value_with_config(rng, col, config)
+
+def generate_values_with_config(rng, col, config, n):
+    """
+    Generate n values for a column in one call.
+    
+    The column is specialized once with compile_value_generator(), so the
+    values equal n successive generate_value_with_config() calls.
+    
+    Args:
+        rng: Random number generator
+        col: ColumnMeta object
+        config: Optional dict with 'min', 'max', 'values', or 'format' keys
+        n: Number of values to generate
+    
+    Returns: List of n generated values
+    """
+    generator = compile_value_generator(col, config)
+    return [generator(rng) for _ in range(n)]
+
+
 ColumnMeta = namedtuple("ColumnMeta", ["name","data_type","is_nullable","column_type","column_key","extra","char_max_length","numeric_precision","numeric_scale","column_default"])
+# FKMeta stays a namedtuple: no per-instance __dict__, C-level field access, Python 3.6 compatible
 FKMeta = namedtuple("FKMeta", ["constraint_name","table_schema","table_name","column_name","referenced_table_schema","referenced_table_name","referenced_column_name","is_logical","condition"])
 TableMeta = namedtuple("TableMeta", ["schema","name","columns","pk_columns","auto_increment","engine"])
 UniqueConstraint = namedtuple("UniqueConstraint", ["constraint_name","columns"])
+# Column metadata laid out as parallel tuples (one entry per column, in table order)
+ColumnMetaTable = namedtuple("ColumnMetaTable", ["columns","names","data_types","nullable"])
+
+
+def build_column_meta_table(columns):
+    """
+    Lay out a table's column metadata as parallel tuples for row generation.
+
+    The per-row loop zips these tuples instead of re-reading and
+    re-normalizing ColumnMeta attributes for every row.
 
+    Args:
+        columns: List of ColumnMeta objects
+
+    Returns:
+        ColumnMetaTable with lowercased data types and is_nullable flags
+    """
+    columns = tuple(columns)
+    return ColumnMetaTable(
+        columns,
+        tuple(col.name for col in columns),
+        tuple((col.data_type or "").lower() for col in columns),
+        tuple(col.is_nullable == "YES" for col in columns),
+    )
+
+@functools.lru_cache(maxsize=512)
 def parse_fk_condition(condition_str):
     """
     Parse a simple FK condition like "T = 'some_string'"
+    
+    Results are cached per condition string, so the same dict is returned
+    for repeated calls and must not be modified by callers.
+    
     Returns: dict with 'column', 'operator', 'value' or None if parsing fails
     """
     if not condition_str:
         return None
     
     # Simple equality check: "column = 'value'"
-    match = re.match(r"^\s*(\w+)\s*=\s*'([^']*)'\s*$", condition_str)
+    match = CompiledPatterns.FK_CONDITION_PATTERN.match(condition_str)
     if match:
         return {
             'column': match.group(1),
@@ -377,27 +643,112 @@ def parse_fk_condition(condition_str):
     # Add support for other patterns as needed
     return None
 
+# Compiled condition evaluators indexed by condition string
+_COND_EVALUATORS = {}
+
+def _compile_fk_condition(condition_str):
+    """
+    Build a row predicate for a FK condition string.
+    Unparseable conditions yield a predicate that never matches.
+    """
+    parsed = parse_fk_condition(condition_str)
+    if not parsed:
+        debug_print("WARNING: Could not parse condition: {0}".format(condition_str))
+        return lambda row: False
+    
+    if parsed['operator'] == '=':
+        return lambda row, c=parsed['column'], v=parsed['value']: row.get(c) == v
+    
+    return lambda row: False
+
 def evaluate_fk_condition(condition_str, row):
     """
     Evaluate a FK condition against a row.
     Returns True if condition is met, False otherwise.
     If condition is None or empty, returns True (unconditional FK).
+    
+    Each condition string is compiled once into a predicate and reused, so
+    per-row evaluation is a single dict lookup and comparison.
     """
     if not condition_str:
         return True
     
-    parsed = parse_fk_condition(condition_str)
-    if not parsed:
-        debug_print("WARNING: Could not parse condition: {0}".format(condition_str))
-        return False
+    fn = _COND_EVALUATORS.get(condition_str)
+    if fn is None:
+        fn = _COND_EVALUATORS[condition_str] = _compile_fk_condition(condition_str)
+    return fn(row)
+
+def build_fk_condition_index(fks):
+    """
+    Index conditional FKs by discriminator column and expected value.
+
+    Allows all conditions of a polymorphic FK column to be matched against a
+    row with one dict lookup per discriminator column, instead of parsing and
+    evaluating every condition in turn.
+
+    Args:
+        fks: List of FKMeta objects (conditions that cannot be parsed are skipped)
+
+    Returns:
+        Dict mapping discriminator column -> {value: [positions in fks]}
+    """
+    index = {}
+    for pos, fk in enumerate(fks):
+        parsed = parse_fk_condition(fk.condition)
+        if not parsed:
+            continue
+        index.setdefault(parsed['column'], {}).setdefault(parsed['value'], []).append(pos)
+    return index
+
+def match_fk_conditions(condition_index, row):
+    """
+    Find the conditional FKs whose condition is met by a row.
+
+    Args:
+        condition_index: Index built by build_fk_condition_index()
+        row: Row dict
+
+    Returns:
+        List of matching positions, in the order the FKs were indexed
+    """
+    matches = []
+    for discriminator_col, value_map in condition_index.items():
+        positions = value_map.get(row.get(discriminator_col))
+        if positions:
+            matches.extend(positions)
+    if len(condition_index) > 1:
+        matches.sort()
+    return matches
+
+
+def sample_range(rng, start, stop, k):
+    """
+    Draw up to k distinct integers from range(start, stop) in random order.
     
-    discriminator_col = parsed['column']
-    discriminator_value = row.get(discriminator_col)
+    Only the k drawn values are built (partial Fisher-Yates via rng.sample),
+    instead of shuffling the whole range and slicing it.
     
-    if parsed['operator'] == '=':
-        return discriminator_value == parsed['value']
+    Args:
+        rng: Random number generator
+        start: First value of the range
+        stop: End of the range (exclusive)
+        k: Number of values wanted (capped at the range size)
     
-    return False
+    Returns: List of distinct integers
+    """
+    size = max(0, stop - start)
+    k = max(0, min(k, size))
+    if size <= sys.maxsize:
+        return rng.sample(range(start, stop), k)
+    # range() too large for len(); collisions are vanishingly rare
+    seen = set()
+    values = []
+    while len(values) < k:
+        value = start + rng.randrange(size)
+        if value not in seen:
+            seen.add(value)
+            values.append(value)
+    return values
 
 
 def generate_unique_value_pool(col_meta, config, needed_count, rng):
@@ -437,24 +788,8 @@ def generate_unique_value_pool(col_meta, config, needed_count, rng):
             print("WARNING: Column {0} range [{1}, {2}] has only {3} values but {4} rows requested".format(
                 col_meta.name, min_val, max_val, range_size, needed_count), file=sys.stderr)
         
-        # For large ranges, sample instead of generating all
-        if range_size > needed_count * 2 and range_size > 100000:
-            # Random sampling for large ranges
-            unique_values = set()
-            max_attempts = needed_count * 10
-            attempts = 0
-            while len(unique_values) < needed_count and attempts < max_attempts:
-                val = rng.randint(int(min_val), int(max_val))
-                unique_values.add(val)
-                attempts += 1
-            pool = list(unique_values)
-        else:
-            # Generate all possible values in range and shuffle
-            all_values = list(range(int(min_val), int(max_val) + 1))
-            rng.shuffle(all_values)
-            pool = all_values[:needed_count]
-        
-        return pool
+        # Sample distinct values without building the whole range
+        return sample_range(rng, int(min_val), int(max_val) + 1, needed_count)
     
     elif dtype in ("decimal", "numeric", "float", "double", "real"):
         min_val = config.get("min", 0.0)
@@ -469,8 +804,12 @@ def generate_unique_value_pool(col_meta, config, needed_count, rng):
         attempts = 0
         max_attempts = needed_count * UNIQUE_VALUE_MAX_ATTEMPTS_MULTIPLIER
         
+        # Same arithmetic as rng.uniform(min_val, max_val), with the span computed once
+        min_val = float(min_val)
+        span = float(max_val) - min_val
+        
         while len(unique_values) < needed_count and attempts < max_attempts:
-            val = round(rng.uniform(float(min_val), float(max_val)), scale)
+            val = round(min_val + span * rng.random(), scale)
             unique_values.add(val)
             attempts += 1
         
@@ -493,22 +832,8 @@ def generate_unique_value_pool(col_meta, config, needed_count, rng):
                 print("WARNING: Column {0} range [{1}, {2}] has only {3} values but {4} rows requested".format(
                     col_meta.name, min_val, max_val, range_size, needed_count), file=sys.stderr)
             
-            # For large ranges, sample instead of generating all
-            if range_size > needed_count * 2 and range_size > 100000:
-                # Random sampling for large ranges
-                unique_values = set()
-                max_attempts = needed_count * 10
-                attempts = 0
-                while len(unique_values) < needed_count and attempts < max_attempts:
-                    val = rng.randint(int(min_val), int(max_val))
-                    unique_values.add(val)
-                    attempts += 1
-                all_values = list(unique_values)
-            else:
-                # Generate all possible values in range and shuffle
-                all_values = list(range(int(min_val), int(max_val) + 1))
-                rng.shuffle(all_values)
-                all_values = all_values[:needed_count]
+            # Sample distinct values without building the whole range
+            all_values = sample_range(rng, int(min_val), int(max_val) + 1, needed_count)
             
             # Apply format if specified
             if "format" in config:
@@ -545,7 +870,7 @@ def generate_unique_value_pool(col_meta, config, needed_count, rng):
         while len(unique_values) < needed_count and attempts < max_attempts:
             # Generate random string
             length = rng.randint(min_length, effective_max)
-            val = ''.join(rng.choice('ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789') for _ in range(length))
+            val = ''.join(rng.choices('ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789', k=length))
             unique_values.add(val)
             attempts += 1
         
@@ -568,21 +893,8 @@ def generate_unique_value_pool(col_meta, config, needed_count, rng):
                     print("WARNING: Column {0} date range has only {1} days but {2} rows requested".format(
                         col_meta.name, delta_days + 1, needed_count), file=sys.stderr)
                 
-                # Generate unique dates
-                if delta_days + 1 > needed_count * 2 and delta_days + 1 > 100000:
-                    # Random sampling for large date ranges
-                    unique_days = set()
-                    max_attempts = needed_count * 10
-                    attempts = 0
-                    while len(unique_days) < needed_count and attempts < max_attempts:
-                        day_offset = rng.randint(0, delta_days)
-                        unique_days.add(day_offset)
-                        attempts += 1
-                    day_offsets = list(unique_days)
-                else:
-                    all_days = list(range(delta_days + 1))
-                    rng.shuffle(all_days)
-                    day_offsets = all_days[:needed_count]
+                # Generate unique dates from distinct day offsets
+                day_offsets = sample_range(rng, 0, delta_days + 1, needed_count)
                 
                 unique_dates = []
                 for day_offset in day_offsets:
@@ -617,8 +929,7 @@ def validate_set_value(set_definition, value):
         return True
     
     # Parse allowed values
-    m = CompiledPatterns.ENUM_PATTERN.findall(set_definition or "")
-    allowed_values = {v.replace("''", "'") for v in m}
+    allowed_values = parse_enum_values(set_definition)
     
     # Parse provided value
     provided_values = [v.strip() for v in str(value).split(',')]
@@ -17,7 +17,8 @@ def load_table_columns(conn, schema, table):
         "WHERE TABLE_SCHEMA=%s AND TABLE_NAME=%s ORDER BY ORDINAL_POSITION",
         (schema, table)
     )
-    return [ColumnMeta(*r) for r in cur.fetchall()]
+    # Intern column names so row dict and constraint set lookups share keys
+    return [ColumnMeta(sys.intern(r[0]), *r[1:]) for r in cur.fetchall()]
 
 
 def load_table_pk(conn, schema, table):
@@ -60,7 +61,7 @@ def load_unique_constraints(conn, schema, table):
     constraints = {}
     for idx_name, col_name, seq in cur.fetchall():
         if idx_name != "PRIMARY":
-            constraints.setdefault(idx_name, []).append(col_name)
+            constraints.setdefault(idx_name, []).append(sys.intern(col_name))
     return [UniqueConstraint(n, tuple(cols)) for n, cols in constraints.items()]
 
 
@@ -5,44 +5,49 @@ This test verifies that the fix correctly generates a true Cartesian product
 instead of using the buggy MAX-based approach with modulo cycling.
 """
 import unittest
-import itertools
+from collections import Counter
+from itertools import cycle, islice
+from cartesian_fixtures import cartesian_rows
 
 
 class TestBugFixVerification(unittest.TestCase):
     """Verify the bug fix implementation."""
     
+    # Problem-statement scenario shared by the tests
+    # (tuples, so no test can change it for the others)
+    A_ID_VALUES = tuple(range(1, 3001))  # 3000 A_IDs
+    PR_VALUES = (0, 1)  # 2 PR values
+    C_ID_VALUES = tuple(range(1, 11))  # 10 C_ID values
+    
     def test_buggy_approach_generates_fewer_combinations(self):
         """Verify that the buggy MAX approach generates fewer combinations."""
         # Scenario from problem statement
-        a_id_values = list(range(1, 3001))  # 3000 A_IDs
-        pr_values = [0, 1]  # 2 PR values
-        c_id_values = list(range(1, 11))  # 10 C_ID values
+        a_id_values = self.A_ID_VALUES  # 3000 A_IDs
+        pr_values = self.PR_VALUES  # 2 PR values
+        c_id_values = self.C_ID_VALUES  # 10 C_ID values
         
         # BUGGY APPROACH: rows_per_shared_combo = max(2, 10) = 10
         rows_per_shared_combo = max(len(pr_values), len(c_id_values))
         
-        buggy_combinations = []
-        for a_id in a_id_values:
-            for local_idx in range(rows_per_shared_combo):
-                combination = {
-                    'A_ID': a_id,
-                    'PR': pr_values[local_idx % len(pr_values)],  # Modulo cycling
-                    'C_ID': c_id_values[local_idx % len(c_id_values)],
-                }
-                buggy_combinations.append(combination)
+        # Modulo cycling: PR cycles 0,1,0,1,... and C_ID cycles 1,2,...,10 in step,
+        # the same pattern for every A_ID
+        cycled = list(islice(zip(cycle(pr_values), cycle(c_id_values)), rows_per_shared_combo))
+        # A_ID, PR and C_ID value lists, one entry per row
+        a_id_col = [a_id for a_id in a_id_values for _ in cycled]
+        pr_col = [pr for pr, _ in cycled] * len(a_id_values)
+        c_id_col = [c_id for _, c_id in cycled] * len(a_id_values)
         
         # Should generate 30,000 combinations (3000 * 10)
-        self.assertEqual(len(buggy_combinations), 30000)
+        self.assertEqual(len(a_id_col), 30000)
+        self.assertEqual(len(pr_col), len(a_id_col))
+        self.assertEqual(len(c_id_col), len(a_id_col))
         
         # Verify that within a single A_ID, PR values repeat
-        a_id_1_rows = [r for r in buggy_combinations if r['A_ID'] == 1]
-        self.assertEqual(len(a_id_1_rows), 10)
+        a_id_1_prs = [pr for a_id, pr in zip(a_id_col, pr_col) if a_id == 1]
+        self.assertEqual(len(a_id_1_prs), 10)
         
         # Count occurrences of each PR value for A_ID=1
-        pr_counts = {}
-        for row in a_id_1_rows:
-            pr = row['PR']
-            pr_counts[pr] = pr_counts.get(pr, 0) + 1
+        pr_counts = Counter(a_id_1_prs)
         
         # With modulo cycling, PR=0 appears 5 times, PR=1 appears 5 times
         self.assertEqual(pr_counts[0], 5, "PR=0 should appear 5 times (showing the bug)")
@@ -51,9 +56,9 @@ class TestBugFixVerification(unittest.TestCase):
     def test_fixed_approach_generates_cartesian_product(self):
         """Verify that the fixed approach generates true Cartesian product."""
         # Same scenario
-        a_id_values = list(range(1, 3001))
-        pr_values = [0, 1]
-        c_id_values = list(range(1, 11))
+        a_id_values = self.A_ID_VALUES
+        pr_values = self.PR_VALUES
+        c_id_values = self.C_ID_VALUES
         
         # FIXED APPROACH: True Cartesian product
         non_shared_value_lists = {
@@ -61,38 +66,25 @@ class TestBugFixVerification(unittest.TestCase):
             'C_ID': c_id_values,
         }
         
-        fixed_combinations = []
-        non_shared_cols = list(non_shared_value_lists.keys())
-        value_lists = [non_shared_value_lists[col] for col in non_shared_cols]
-        
-        for a_id in a_id_values:
-            for combo in itertools.product(*value_lists):
-                combination = {'A_ID': a_id}
-                for col_name, value in zip(non_shared_cols, combo):
-                    combination[col_name] = value
-                fixed_combinations.append(combination)
+        fixed_combinations = cartesian_rows('A_ID', a_id_values, non_shared_value_lists)
         
         # Should generate 60,000 combinations (3000 * 2 * 10)
         self.assertEqual(len(fixed_combinations), 60000)
         
         # Verify that all 60,000 combinations are unique 3-tuples
-        unique_tuples = set()
-        for row in fixed_combinations:
-            tuple_key = (row['A_ID'], row['PR'], row['C_ID'])
-            self.assertNotIn(tuple_key, unique_tuples, 
-                           "Each 3-tuple should be unique in the Cartesian product")
-            unique_tuples.add(tuple_key)
-        
-        self.assertEqual(len(unique_tuples), 60000)
+        # (rows are (A_ID, PR, C_ID) namedtuples, so they are the keys)
+        unique_tuples = set(fixed_combinations)
+        self.assertEqual(len(unique_tuples), 60000,
+                        "Each 3-tuple should be unique in the Cartesian product")
         
         # Verify that for A_ID=1, each PR value appears exactly 10 times
         # (once for each C_ID)
-        a_id_1_rows = [r for r in fixed_combinations if r['A_ID'] == 1]
+        a_id_1_rows = [r for r in fixed_combinations if r.A_ID == 1]
         self.assertEqual(len(a_id_1_rows), 20)  # 2 PR * 10 C_ID
         
         pr_counts = {}
         for row in a_id_1_rows:
-            pr = row['PR']
+            pr = row.PR
             pr_counts[pr] = pr_counts.get(pr, 0) + 1
         
         # Each PR should appear exactly 10 times (once for each C_ID)
@@ -100,18 +92,15 @@ class TestBugFixVerification(unittest.TestCase):
         self.assertEqual(pr_counts[1], 10, "PR=1 should appear 10 times")
         
         # Verify that each (A_ID=1, PR, C_ID) combination is unique
-        a_id_1_tuples = set()
-        for row in a_id_1_rows:
-            tuple_key = (row['A_ID'], row['PR'], row['C_ID'])
-            a_id_1_tuples.add(tuple_key)
+        a_id_1_tuples = set(a_id_1_rows)
         self.assertEqual(len(a_id_1_tuples), 20, 
                         "All 20 combinations for A_ID=1 should be unique")
     
     def test_cartesian_product_improvement_over_buggy(self):
         """Verify that Cartesian product generates more combinations than buggy approach."""
-        a_id_values = list(range(1, 3001))
-        pr_values = [0, 1]
-        c_id_values = list(range(1, 11))
+        a_id_values = self.A_ID_VALUES
+        pr_values = self.PR_VALUES
+        c_id_values = self.C_ID_VALUES
         
         # Buggy combinations
         buggy_count = len(a_id_values) * max(len(pr_values), len(c_id_values))
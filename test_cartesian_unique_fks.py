@@ -6,12 +6,14 @@ use Cartesian product to guarantee uniqueness.
 """
 import unittest
 import random
+from itertools import product
 from generate_synthetic_data_utils import (
     ColumnMeta,
     UniqueConstraint,
     TableMeta,
     FKMeta,
 )
+from generate_synthetic_data_patterns import LazyCartesianProduct, sample_cartesian_product
 
 
 class TestCartesianUniqueDetection(unittest.TestCase):
@@ -116,15 +118,13 @@ class TestCartesianProductGeneration(unittest.TestCase):
     
     def test_cartesian_product_basic(self):
         """Test basic Cartesian product generation."""
-        import itertools
-        
         # Parent A: 3 values
         parent_a_values = [1, 2, 3]
         # Parent C: 2 values
         parent_c_values = [10, 20]
         
         # Generate Cartesian product
-        all_combinations = list(itertools.product(parent_a_values, parent_c_values))
+        all_combinations = list(product(parent_a_values, parent_c_values))
         
         # Should have 3 * 2 = 6 combinations
         self.assertEqual(len(all_combinations), 6)
@@ -138,13 +138,11 @@ class TestCartesianProductGeneration(unittest.TestCase):
     
     def test_cartesian_product_three_columns(self):
         """Test Cartesian product with three FK columns."""
-        import itertools
-        
         parent_a_values = [1, 2]
         parent_b_values = [10, 20]
         parent_c_values = [100, 200]
         
-        all_combinations = list(itertools.product(parent_a_values, parent_b_values, parent_c_values))
+        all_combinations = list(product(parent_a_values, parent_b_values, parent_c_values))
         
         # Should have 2 * 2 * 2 = 8 combinations
         self.assertEqual(len(all_combinations), 8)
@@ -152,24 +150,20 @@ class TestCartesianProductGeneration(unittest.TestCase):
     
     def test_cartesian_product_sampling(self):
         """Test sampling when more combinations than needed rows."""
-        import itertools
-        import random
-        
         # Using seed for reproducible test results
         rng = random.Random(42)
         
         parent_a_values = list(range(1, 101))  # 100 values
         parent_c_values = list(range(1, 11))   # 10 values
         
-        all_combinations = list(itertools.product(parent_a_values, parent_c_values))
+        all_combinations = LazyCartesianProduct([parent_a_values, parent_c_values])
         
         # Should have 100 * 10 = 1000 combinations
-        self.assertEqual(len(all_combinations), 1000)
+        self.assertEqual(all_combinations.size, 1000)
         
-        # Sample 500 combinations
+        # Sample 500 combinations without materializing the product
         needed_rows = 500
-        rng.shuffle(all_combinations)
-        sampled = all_combinations[:needed_rows]
+        sampled = sample_cartesian_product([parent_a_values, parent_c_values], needed_rows, rng)
         
         # Should have exactly 500 combinations
         self.assertEqual(len(sampled), needed_rows)
@@ -179,12 +173,10 @@ class TestCartesianProductGeneration(unittest.TestCase):
     
     def test_cartesian_product_insufficient_combinations(self):
         """Test when there are fewer combinations than requested rows."""
-        import itertools
-        
         parent_a_values = [1, 2, 3]  # 3 values
         parent_c_values = [10, 20]    # 2 values
         
-        all_combinations = list(itertools.product(parent_a_values, parent_c_values))
+        all_combinations = list(product(parent_a_values, parent_c_values))
         
         # Should have 3 * 2 = 6 combinations
         self.assertEqual(len(all_combinations), 6)
@@ -208,15 +200,13 @@ class TestPreAllocatedUniqueFK(unittest.TestCase):
     
     def test_pre_allocated_dict_structure(self):
         """Test the structure of pre-allocated UNIQUE FK tuples."""
-        import itertools
-        
         # Simulate parent values
         parent_a_values = [1, 2, 3]
         parent_c_values = [10, 20]
         parent_col_names = ["A_ID", "C_ID"]
         
         # Generate combinations
-        all_combinations = list(itertools.product(parent_a_values, parent_c_values))
+        all_combinations = list(product(parent_a_values, parent_c_values))
         
         # Pre-allocate for 6 rows
         pre_allocated_unique_fk_tuples = {}
@@ -327,25 +317,23 @@ class TestUniquenessGuarantee(unittest.TestCase):
     
     def test_uniqueness_with_sufficient_combinations(self):
         """Test that all rows have unique combinations when sufficient parent values exist."""
-        import itertools
         
         # Parent tables
         parent_a_values = list(range(1, 3001))  # 3000 values
         parent_c_values = list(range(1, 11))    # 10 values
         
-        # Generate all combinations
-        all_combinations = list(itertools.product(parent_a_values, parent_c_values))
+        # Index all combinations lazily
+        all_combinations = LazyCartesianProduct([parent_a_values, parent_c_values])
         
         # Should have 3000 * 10 = 30,000 combinations
-        self.assertEqual(len(all_combinations), 30000)
+        self.assertEqual(all_combinations.size, 30000)
         
         # Request 6000 rows
         needed_rows = 6000
         
         # Sample combinations with reproducible seed for testing
         rng = random.Random(42)
-        rng.shuffle(all_combinations)
-        sampled = all_combinations[:needed_rows]
+        sampled = sample_cartesian_product([parent_a_values, parent_c_values], needed_rows, rng)
         
         # All 6000 rows should have unique combinations
         self.assertEqual(len(sampled), needed_rows)
@@ -353,14 +341,12 @@ class TestUniquenessGuarantee(unittest.TestCase):
     
     def test_detect_duplicate_combinations(self):
         """Test detection when duplicates would occur (insufficient parent values)."""
-        import itertools
-        
         # Parent tables with limited values
         parent_a_values = [1, 2, 3]  # 3 values
         parent_c_values = [10, 20]    # 2 values
         
         # Generate all combinations
-        all_combinations = list(itertools.product(parent_a_values, parent_c_values))
+        all_combinations = list(product(parent_a_values, parent_c_values))
         
         # Should have 3 * 2 = 6 combinations
         self.assertEqual(len(all_combinations), 6)
@@ -287,18 +287,15 @@ class TestSequentialGenerationForCompositeUnique(unittest.TestCase):
     
     def test_sequential_values_are_unique(self):
         """Test that sequential generation produces unique values."""
-        values = set()
-        for i in range(10000):
-            value = "seq_{0:08d}".format(i)
-            self.assertNotIn(value, values)
-            values.add(value)
+        # Any duplicate value would shrink the set
+        values = set(map("seq_{0:08d}".format, range(10000)))
         self.assertEqual(len(values), 10000)
     
     def test_sequential_values_with_controlled_prefix(self):
         """Test that sequential values work with controlled column values."""
         # Simulate a composite UNIQUE constraint with category (controlled) and code (sequential)
         categories = ["electronics", "furniture", "clothing"]
-        combinations = set()
+        combinations = []
         counter = 0
         
         # Generate 1000 combinations
@@ -306,12 +303,10 @@ class TestSequentialGenerationForCompositeUnique(unittest.TestCase):
             category = categories[i % len(categories)]  # Cycle through categories
             code = "seq_{0:08d}".format(counter)
             counter += 1
-            
-            combo = (category, code)
-            self.assertNotIn(combo, combinations)
-            combinations.add(combo)
+            combinations.append((category, code))
         
-        self.assertEqual(len(combinations), 1000)
+        # Any duplicate would shrink the set
+        self.assertEqual(len(set(combinations)), 1000)
     
     def test_sequential_handles_large_row_counts(self):
         """Test that sequential generation handles 10+ million rows."""
@@ -327,10 +322,8 @@ class TestSequentialGenerationForCompositeUnique(unittest.TestCase):
     
     def test_sequential_integer_values(self):
         """Test sequential generation for integer columns."""
-        values = set()
-        for counter in range(10000):
-            self.assertNotIn(counter, values)
-            values.add(counter)
+        # Any duplicate counter value would shrink the set
+        values = set(range(10000))
         self.assertEqual(len(values), 10000)
 
 
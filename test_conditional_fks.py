@@ -3,7 +3,10 @@
 import unittest
 from generate_synthetic_data_utils import (
     parse_fk_condition, 
-    evaluate_fk_condition, 
+    evaluate_fk_condition,
+    build_fk_condition_index,
+    match_fk_conditions,
+    _COND_EVALUATORS,
     FKMeta,
     GLOBALS
 )
@@ -13,87 +16,119 @@ from generate_synthetic_data import load_logical_fks_from_config
 class TestParseCondition(unittest.TestCase):
     """Test the parse_fk_condition function"""
     
-    def test_parse_simple_equality(self):
-        """Test parsing simple equality condition"""
-        result = parse_fk_condition("T = 'some_string'")
-        self.assertEqual(result['column'], 'T')
-        self.assertEqual(result['operator'], '=')
-        self.assertEqual(result['value'], 'some_string')
+    # (description, condition, expected parse result)
+    PARSE_CASES = [
+        ("simple equality", "T = 'some_string'",
+         {'column': 'T', 'operator': '=', 'value': 'some_string'}),
+        ("extra spaces", "  type  =  'Post'  ",
+         {'column': 'type', 'operator': '=', 'value': 'Post'}),
+        ("underscore in column name", "account_type = 'personal'",
+         {'column': 'account_type', 'operator': '=', 'value': 'personal'}),
+        ("empty string value", "status = ''",
+         {'column': 'status', 'operator': '=', 'value': ''}),
+        ("None condition", None, None),
+        ("empty string condition", "", None),
+        ("invalid format", "T == 'value'", None),
+        ("no quotes (should fail)", "T = value", None),
+    ]
     
-    def test_parse_with_spaces(self):
-        """Test parsing condition with extra spaces"""
-        result = parse_fk_condition("  type  =  'Post'  ")
-        self.assertEqual(result['column'], 'type')
-        self.assertEqual(result['operator'], '=')
-        self.assertEqual(result['value'], 'Post')
+    def test_parse(self):
+        """Test parsing valid, empty and invalid conditions"""
+        for description, condition, expected in self.PARSE_CASES:
+            with self.subTest(description):
+                self.assertEqual(parse_fk_condition(condition), expected)
     
-    def test_parse_underscore_column(self):
-        """Test parsing condition with underscore in column name"""
-        result = parse_fk_condition("account_type = 'personal'")
-        self.assertEqual(result['column'], 'account_type')
-        self.assertEqual(result['operator'], '=')
-        self.assertEqual(result['value'], 'personal')
-    
-    def test_parse_empty_value(self):
-        """Test parsing condition with empty string value"""
-        result = parse_fk_condition("status = ''")
-        self.assertEqual(result['column'], 'status')
-        self.assertEqual(result['operator'], '=')
-        self.assertEqual(result['value'], '')
-    
-    def test_parse_none(self):
-        """Test parsing None condition"""
-        result = parse_fk_condition(None)
-        self.assertIsNone(result)
-    
-    def test_parse_empty_string(self):
-        """Test parsing empty string condition"""
-        result = parse_fk_condition("")
-        self.assertIsNone(result)
-    
-    def test_parse_invalid_format(self):
-        """Test parsing invalid format"""
-        result = parse_fk_condition("T == 'value'")
-        self.assertIsNone(result)
-    
-    def test_parse_no_quotes(self):
-        """Test parsing condition without quotes (should fail)"""
-        result = parse_fk_condition("T = value")
-        self.assertIsNone(result)
+    def test_parse_is_cached(self):
+        """Test repeated parses of the same condition reuse the cached result"""
+        first = parse_fk_condition("kind = 'cached'")
+        second = parse_fk_condition("kind = 'cached'")
+        self.assertIs(first, second)
 
 
 class TestEvaluateCondition(unittest.TestCase):
     """Test the evaluate_fk_condition function"""
     
-    def test_evaluate_matching_condition(self):
-        """Test evaluating a condition that matches"""
-        row = {'T': 'some_string', 'P_ID': None}
-        result = evaluate_fk_condition("T = 'some_string'", row)
-        self.assertTrue(result)
+    # (description, condition, row, expected result)
+    EVALUATE_CASES = [
+        ("matching condition", "T = 'some_string'", {'T': 'some_string', 'P_ID': None}, True),
+        ("non-matching condition", "T = 'some_string'", {'T': 'other_string', 'P_ID': None}, False),
+        # Missing column means condition not met
+        ("missing discriminator column", "T = 'some_string'", {'P_ID': None}, False),
+        ("None condition (unconditional FK)", None, {'T': 'any_value', 'P_ID': None}, True),
+        ("empty condition (unconditional FK)", "", {'T': 'any_value', 'P_ID': None}, True),
+    ]
     
-    def test_evaluate_non_matching_condition(self):
-        """Test evaluating a condition that doesn't match"""
-        row = {'T': 'other_string', 'P_ID': None}
-        result = evaluate_fk_condition("T = 'some_string'", row)
-        self.assertFalse(result)
+    def test_evaluate(self):
+        """Test evaluating matching, non-matching and unconditional conditions"""
+        for description, condition, row, expected in self.EVALUATE_CASES:
+            with self.subTest(description):
+                self.assertIs(evaluate_fk_condition(condition, row), expected)
     
-    def test_evaluate_missing_column(self):
-        """Test evaluating when discriminator column is missing"""
-        row = {'P_ID': None}
-        result = evaluate_fk_condition("T = 'some_string'", row)
-        self.assertFalse(result)  # Missing column means condition not met
+    def test_evaluate_compiled_matches_interpreted(self):
+        """Test cached evaluators agree with interpreting the parsed condition"""
+        for description, condition, row, _ in self.EVALUATE_CASES:
+            with self.subTest(description):
+                parsed = parse_fk_condition(condition)
+                if parsed is None:
+                    interpreted = not condition
+                else:
+                    interpreted = row.get(parsed['column']) == parsed['value']
+                self.assertIs(evaluate_fk_condition(condition, row), interpreted)
     
-    def test_evaluate_none_condition(self):
-        """Test evaluating None condition (unconditional FK)"""
-        row = {'T': 'any_value', 'P_ID': None}
-        result = evaluate_fk_condition(None, row)
-        self.assertTrue(result)
-    
-    def test_evaluate_empty_condition(self):
-        """Test evaluating empty condition (unconditional FK)"""
-        row = {'T': 'any_value', 'P_ID': None}
-        result = evaluate_fk_condition("", row)
-        self.assertTrue(result)
+    def test_evaluate_compiles_condition_once(self):
+        """Test repeated evaluation of a condition compiles a single evaluator"""
+        condition = "kind = 'evaluated_once'"
+        _COND_EVALUATORS.pop(condition, None)
+        before = len(_COND_EVALUATORS)
+        for value in ('evaluated_once', 'other', 'evaluated_once'):
+            evaluate_fk_condition(condition, {'kind': value})
+        self.assertEqual(len(_COND_EVALUATORS), before + 1)
+        self.assertIn(condition, _COND_EVALUATORS)
+
+
+class TestFKConditionIndex(unittest.TestCase):
+    """Test build_fk_condition_index and match_fk_conditions"""
+
+    def setUp(self):
+        self.fks = [
+            MockFK('LOGICAL_X_P_ID_W', 'P_ID', "T = 'W'"),
+            MockFK('LOGICAL_X_P_ID_H', 'P_ID', "T = 'H'"),
+            MockFK('LOGICAL_X_P_ID_K', 'P_ID', "K = 'yes'"),
+            MockFK('LOGICAL_X_P_ID_W2', 'P_ID', "T = 'W'"),
+        ]
+        self.index = build_fk_condition_index(self.fks)
+
+    def test_index_groups_by_discriminator(self):
+        """Test conditions are grouped by column and value"""
+        self.assertEqual(self.index, {
+            'T': {'W': [0, 3], 'H': [1]},
+            'K': {'yes': [2]},
+        })
+
+    def test_match_single_condition(self):
+        """Test a row matching one condition"""
+        self.assertEqual(match_fk_conditions(self.index, {'T': 'H'}), [1])
+
+    def test_match_preserves_config_order(self):
+        """Test matches across discriminator columns come back in config order"""
+        self.assertEqual(match_fk_conditions(self.index, {'T': 'W', 'K': 'yes'}), [0, 2, 3])
+
+    def test_no_match(self):
+        """Test a row matching no condition"""
+        self.assertEqual(match_fk_conditions(self.index, {'T': 'other'}), [])
+        self.assertEqual(match_fk_conditions(self.index, {}), [])
+
+    def test_matches_agree_with_evaluate(self):
+        """Test index matching gives the same answer as evaluate_fk_condition"""
+        for row in ({'T': 'W'}, {'T': 'H', 'K': 'yes'}, {'T': None}, {'K': 'no'}):
+            expected = [i for i, fk in enumerate(self.fks)
+                        if evaluate_fk_condition(fk.condition, row)]
+            self.assertEqual(match_fk_conditions(self.index, row), expected)
+
+    def test_invalid_condition_skipped(self):
+        """Test unparseable conditions are left out of the index"""
+        index = build_fk_condition_index([MockFK('BAD', 'P_ID', "T == 'x'")])
+        self.assertEqual(index, {})
 
 
 class TestFKMetaWithCondition(unittest.TestCase):
@@ -130,6 +165,41 @@ class TestFKMetaWithCondition(unittest.TestCase):
         )
         self.assertIsNone(fk.condition)
         self.assertFalse(fk.is_logical)
+    
+    def test_fk_meta_interned(self):
+        """Test loaded FKs share interned name and condition strings"""
+        # Built at runtime so the literals' own interning does not mask the check
+        schema = "".join(["d", "b"])
+        config = [
+            {
+                "schema": schema,
+                "table": "X",
+                "logical_fks": [
+                    {
+                        "column": "P_ID",
+                        "referenced_schema": "".join(["d", "b"]),
+                        "referenced_table": "W",
+                        "referenced_column": "ID",
+                        "condition": "  T = 'shared'  "
+                    },
+                    {
+                        "column": "Q_ID",
+                        "referenced_schema": "".join(["d", "b"]),
+                        "referenced_table": "H",
+                        "referenced_column": "ID",
+                        "condition": "".join(["T = 'shared'"])
+                    }
+                ]
+            }
+        ]
+        
+        single_fks, _ = load_logical_fks_from_config(config)
+        
+        self.assertIs(single_fks[0].table_schema, single_fks[1].table_schema)
+        self.assertIs(single_fks[0].referenced_table_schema, single_fks[1].referenced_table_schema)
+        self.assertIs(single_fks[0].table_schema, single_fks[0].referenced_table_schema)
+        self.assertEqual(single_fks[0].condition, "T = 'shared'")
+        self.assertIs(single_fks[0].condition, single_fks[1].condition)
 
 
 class TestLoadLogicalFKsWithCondition(unittest.TestCase):
@@ -240,6 +310,77 @@ class TestLoadLogicalFKsWithCondition(unittest.TestCase):
         # Third FK is conditional
         self.assertEqual(single_fks[2].column_name, "poly_id")
         self.assertEqual(single_fks[2].condition, "type = 'B'")
+    
+    def test_repeated_load(self):
+        """Test loading an equal config twice gives equal, independent FKs"""
+        config = [
+            {
+                "schema": "db",
+                "table": "cached",
+                "logical_fks": [
+                    {
+                        "column": "P_ID",
+                        "referenced_schema": "db",
+                        "referenced_table": "W",
+                        "referenced_column": "ID",
+                        "condition": "T = 'cached'"
+                    },
+                    {
+                        "child_columns": ["A", "B"],
+                        "referenced_schema": "db",
+                        "referenced_table": "H",
+                        "referenced_columns": ["A", "B"]
+                    }
+                ]
+            }
+        ]
+        
+        single_1, composite_1 = load_logical_fks_from_config(config)
+        single_2, composite_2 = load_logical_fks_from_config([dict(config[0])])
+        
+        self.assertEqual(single_1, single_2)
+        self.assertEqual(composite_1, composite_2)
+        self.assertEqual(composite_1[0]["child_columns"], ("A", "B"))
+        
+        # Returned containers are independent between loads
+        single_1.append(None)
+        composite_1[0]["population_rate"] = 0.5
+        single_3, composite_3 = load_logical_fks_from_config(config)
+        self.assertEqual(len(single_3), 1)
+        self.assertIsNone(composite_3[0]["population_rate"])
+    
+    def test_load_many_tables(self):
+        """Test loading a 10k-table config builds one interned FK per table"""
+        # Names and conditions are built per table so equal values start out as
+        # distinct string objects
+        config = [
+            {
+                "schema": "".join(["d", "b"]),
+                "table": "T{0}".format(i),
+                "logical_fks": [
+                    {
+                        "column": "".join(["P_", "ID"]),
+                        "referenced_schema": "".join(["d", "b"]),
+                        "referenced_table": "".join(["W", ""]),
+                        "referenced_column": "".join(["I", "D"]),
+                        "condition": "".join(["T = 'some_string'", " "])
+                    }
+                ]
+            }
+            for i in range(10000)
+        ]
+        
+        single_fks, composite_fks = load_logical_fks_from_config(config)
+        
+        self.assertEqual(len(single_fks), 10000)
+        self.assertEqual(single_fks[-1].constraint_name, "LOGICAL_T9999_P_ID")
+        self.assertEqual(composite_fks, [])
+        self.assertEqual({fk.condition for fk in single_fks}, {"T = 'some_string'"})
+        first, last = single_fks[0], single_fks[-1]
+        for field in ("table_schema", "column_name", "referenced_table_schema",
+                      "referenced_table_name", "referenced_column_name", "condition"):
+            with self.subTest(field=field):
+                self.assertIs(getattr(first, field), getattr(last, field))
 
 
 class TestCompositeConditionalFKs(unittest.TestCase):
@@ -282,8 +423,6 @@ class TestConditionalFKParentCaching(unittest.TestCase):
     
     def test_conditional_fk_parent_values_combined(self):
         """Test that conditional FK parent values are combined for Cartesian product"""
-        from collections import defaultdict
-        
         # Simulate the fix logic: combining conditional FK parent values into parent_caches
         # This mimics what happens in resolve_fks_batch() after the fix
         
@@ -295,9 +434,9 @@ class TestConditionalFKParentCaching(unittest.TestCase):
         
         # FKs grouped by column (as created by conditional_fks_by_column)
         # Key is column name, value is list of FK objects with constraint_name attribute
-        conditional_fks_by_column = defaultdict(list)
-        conditional_fks_by_column['P_ID'].append(MockFK('LOGICAL_A_P_ID_W', 'P_ID', "T = 'some_string'"))
-        conditional_fks_by_column['P_ID'].append(MockFK('LOGICAL_A_P_ID_H', 'P_ID', "T = 'some_other_string'"))
+        conditional_fks_by_column = {}
+        conditional_fks_by_column.setdefault('P_ID', []).append(MockFK('LOGICAL_A_P_ID_W', 'P_ID', "T = 'some_string'"))
+        conditional_fks_by_column.setdefault('P_ID', []).append(MockFK('LOGICAL_A_P_ID_H', 'P_ID', "T = 'some_other_string'"))
         
         # Initially, parent_caches is empty for P_ID (no unconditional FK)
         parent_caches = {}
@@ -319,14 +458,12 @@ class TestConditionalFKParentCaching(unittest.TestCase):
     
     def test_conditional_fk_does_not_override_unconditional(self):
         """Test that conditional FK values don't override existing unconditional FK values"""
-        from collections import defaultdict
-        
         conditional_fk_caches = {
             'LOGICAL_A_P_ID_W': [1, 2, 3],
         }
         
-        conditional_fks_by_column = defaultdict(list)
-        conditional_fks_by_column['P_ID'].append(MockFK('LOGICAL_A_P_ID_W', 'P_ID', "T = 'some_string'"))
+        conditional_fks_by_column = {}
+        conditional_fks_by_column.setdefault('P_ID', []).append(MockFK('LOGICAL_A_P_ID_W', 'P_ID', "T = 'some_string'"))
         
         # parent_caches already has values for P_ID from an unconditional FK
         parent_caches = {'P_ID': [100, 200, 300]}
@@ -346,12 +483,10 @@ class TestConditionalFKParentCaching(unittest.TestCase):
     
     def test_empty_conditional_fk_caches(self):
         """Test handling when conditional FK caches are empty"""
-        from collections import defaultdict
-        
         conditional_fk_caches = {}  # Empty caches
         
-        conditional_fks_by_column = defaultdict(list)
-        conditional_fks_by_column['P_ID'].append(MockFK('LOGICAL_A_P_ID_W', 'P_ID', "T = 'some_string'"))
+        conditional_fks_by_column = {}
+        conditional_fks_by_column.setdefault('P_ID', []).append(MockFK('LOGICAL_A_P_ID_W', 'P_ID', "T = 'some_string'"))
         
         parent_caches = {}
         
@@ -370,4 +505,9 @@ class TestConditionalFKParentCaching(unittest.TestCase):
 
 
 if __name__ == '__main__':
-    unittest.main()
+    import fast_loader
+    # Must cover every repo module this file imports, directly or transitively;
+    # a stale list lets CachedLoader skip this file after those modules change.
+    fast_loader.main(__file__, deps=["generate_synthetic_data.py",
+                                     "generate_synthetic_data_utils.py",
+                                     "generate_synthetic_data_patterns.py"])
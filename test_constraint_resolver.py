@@ -2,8 +2,11 @@
 """Unit tests for ConstraintResolver class"""
 import unittest
 import random
+import itertools
+from unittest import mock
 from collections import namedtuple
-from constraint_resolver import ConstraintResolver
+from constraint_resolver import ConstraintResolver, CARTESIAN_MATERIALIZE_LIMIT
+from generate_synthetic_data_patterns import LazyCartesianProduct, sample_cartesian_product
 
 # Mock data structures
 UniqueConstraint = namedtuple("UniqueConstraint", ["constraint_name", "columns"])
@@ -48,6 +51,24 @@ class TestConstraintResolver(unittest.TestCase):
         self.assertEqual(len(composite), 2)
         self.assertEqual(comp_cols, {"user_id", "org_id", "name", "created_date"})
     
+    def test_classify_unique_constraints_cached(self):
+        """Test classification is cached per table and immutable"""
+        table_key = "test.users"
+        self.unique_constraints[table_key] = [
+            UniqueConstraint("uk_email", ("email",)),
+            UniqueConstraint("uk_user_org", ("user_id", "org_id"))
+        ]
+        
+        first = self.resolver.classify_unique_constraints(table_key)
+        second = self.resolver.classify_unique_constraints(table_key)
+        
+        self.assertIs(first, second)
+        single, composite, comp_cols = first
+        self.assertIsInstance(single, frozenset)
+        self.assertIsInstance(comp_cols, frozenset)
+        self.assertEqual(single, {"email"})
+        self.assertEqual(comp_cols, {"user_id", "org_id"})
+    
     def test_build_cartesian_product(self):
         """Test building Cartesian product of value lists"""
         value_lists = [
@@ -61,7 +82,77 @@ class TestConstraintResolver(unittest.TestCase):
         self.assertEqual(len(product), 8)
         self.assertIn((1, 'a', True), product)
         self.assertIn((2, 'b', False), product)
+    
+    def test_build_cartesian_product_lazy(self):
+        """Test large Cartesian products are indexed lazily in product order"""
+        value_lists = [list(range(1000)), list(range(100)), ['x', 'y', 'z']]
+        self.assertGreater(1000 * 100 * 3, CARTESIAN_MATERIALIZE_LIMIT)
+        
+        product = self.resolver.build_cartesian_product(value_lists)
+        
+        self.assertIsInstance(product, LazyCartesianProduct)
+        self.assertEqual(len(product), 1000 * 100 * 3)
+        self.assertIn((42, 7, 'y'), product)
+        self.assertNotIn((42, 7, 'w'), product)
+        self.assertNotIn((42, 7), product)
+        expected = list(itertools.islice(itertools.product(*value_lists), 500))
+        self.assertEqual([product[i] for i in range(500)], expected)
+        self.assertEqual(product[-1], (999, 99, 'z'))
+    
+    def test_lazy_cartesian_product_take(self):
+        """Test batch decoding matches indexing one combination at a time"""
+        product = LazyCartesianProduct([list(range(30)), [0, 1], ['x', 'y', 'z']])
+        indexes = [0, 179, 5, 42, 5, 100]
+        
+        self.assertEqual(product.take(indexes), [product[i] for i in indexes])
+        self.assertEqual(product.take([]), [])
+        self.assertEqual(LazyCartesianProduct([['a', 'b']]).take([1, 0]), [('b',), ('a',)])
+    
+    def test_build_cartesian_product_does_not_materialize(self):
+        """Test huge Cartesian products are never enumerated"""
+        with mock.patch('itertools.product', side_effect=AssertionError("product materialized")):
+            product = self.resolver.build_cartesian_product([list(range(100))] * 100)
+            
+            self.assertEqual(product.size, 100 ** 100)
+            self.assertIn(tuple(range(100)), product)
+            self.assertEqual(product[product.size - 1], (99,) * 100)
+            
+            sample = sample_cartesian_product([list(range(100))] * 100, 3, random.Random(1))
+            self.assertEqual(len(set(sample)), 3)
+    
+    def test_find_overlapping_constraints(self):
+        """Test constraints sharing columns are grouped once per distinct group"""
+        acs = UniqueConstraint("uk_acs", ("A_ID", "C_ID"))
+        apr = UniqueConstraint("uk_apr", ("A_ID", "PR"))
+        other = UniqueConstraint("uk_other", ("X", "Y"))
+        
+        groups = self.resolver.find_overlapping_constraints([acs, apr, other])
+        
+        self.assertEqual(len(groups), 1)
+        self.assertEqual(set(groups[0]), {acs, apr})
+        self.assertEqual(self.resolver.find_overlapping_constraints([acs, other]), [])
+    
+    def test_sample_cartesian_product(self):
+        """Test sampling distinct combinations without materializing the product"""
+        value_lists = [[1, 2, 3], ['a', 'b'], [True, False]]
+        rng = random.Random(42)
+        
+        sample = sample_cartesian_product(value_lists, 5, rng)
+        self.assertEqual(len(sample), 5)
+        self.assertEqual(len(set(sample)), 5)
+        all_combos = set(itertools.product(*value_lists))
+        self.assertTrue(set(sample) <= all_combos)
+        
+        # Requests beyond the product size return every combination once
+        sample = sample_cartesian_product(value_lists, 100, rng)
+        self.assertEqual(set(sample), all_combos)
+        self.assertEqual(len(sample), 12)
 
 
 if __name__ == '__main__':
-    unittest.main()
+    import fast_loader
+    # Must cover every repo module this file imports, directly or transitively;
+    # a stale list lets CachedLoader skip this file after those modules change.
+    fast_loader.main(__file__, deps=["constraint_resolver.py",
+                                     "generate_synthetic_data_utils.py",
+                                     "generate_synthetic_data_patterns.py"])
@@ -1,18 +1,43 @@
 #!/usr/bin/env python3
 """Unit tests for extended populate_columns configuration feature"""
+import functools
+import re
 import unittest
 import random
-from datetime import datetime
+from unittest import mock
+from datetime import datetime, timedelta
 from generate_synthetic_data_utils import (
     parse_date,
     parse_populate_columns_config,
     validate_populate_column_config,
     generate_value_with_config,
+    generate_values_with_config,
+    compile_value_generator,
+    compile_int_format,
+    build_column_meta_table,
+    text_column_generator,
+    is_age_column,
+    rand_email,
+    rand_name,
+    rand_phone,
+    rand_string,
+    rand_datetime,
     ColumnMeta,
     GLOBALS
 )
 
 
+@functools.lru_cache(maxsize=None)
+def _cached_column(name, data_type, is_nullable, column_type, char_max_length):
+    """Build a ColumnMeta once per distinct argument tuple (ColumnMeta is immutable)"""
+    return ColumnMeta(
+        name=name, data_type=data_type, is_nullable=is_nullable,
+        column_type=column_type, column_key="", extra="",
+        char_max_length=char_max_length, numeric_precision=10, numeric_scale=2,
+        column_default=None
+    )
+
+
 class TestParseDate(unittest.TestCase):
     """Test the parse_date function"""
     
@@ -60,6 +85,17 @@ class TestParseDate(unittest.TestCase):
         
         result = parse_date("01/15/2020")  # Wrong format
         self.assertIsNone(result)
+    
+    def test_parse_date_cached(self):
+        """Test repeated parses of the same string reuse the cached datetime"""
+        self.assertIs(parse_date("2021-07-04 12:00:00"), parse_date("2021-07-04 12:00:00"))
+    
+    def test_parse_date_other_iso_forms_rejected(self):
+        """Test ISO 8601 forms outside the supported formats still return None"""
+        self.assertIsNone(parse_date("2020-W03-3"))  # ISO week date
+        self.assertIsNone(parse_date("2020-01-15T14:30+01"))  # Timezone offset
+        self.assertIsNone(parse_date("2020-01-15 14:30:45.123"))  # Fractional seconds
+        self.assertIsNone(parse_date("2020-02-30"))
 
 
 class TestParsePopulateColumnsConfig(unittest.TestCase):
@@ -201,6 +237,18 @@ class TestParsePopulateColumnsConfig(unittest.TestCase):
         result = parse_populate_columns_config(table_cfg)
         
         self.assertEqual(len(result), 0)
+    
+    def test_parse_cached_per_table_config(self):
+        """Test repeated parsing of one table config reuses the result until it changes"""
+        table_cfg = {"schema": "db", "table": "users", "populate_columns": ["age"]}
+        first = parse_populate_columns_config(table_cfg)
+        self.assertIs(parse_populate_columns_config(table_cfg), first)
+        self.assertIsNot(parse_populate_columns_config(dict(table_cfg)), first)
+        
+        table_cfg["populate_columns"].append({"column": "status", "values": ["a"]})
+        self.assertEqual(set(parse_populate_columns_config(table_cfg)), {"age", "status"})
+        table_cfg["populate_columns"] = ["salary"]
+        self.assertEqual(set(parse_populate_columns_config(table_cfg)), {"salary"})
 
 
 class TestValidatePopulateColumnConfig(unittest.TestCase):
@@ -208,12 +256,7 @@ class TestValidatePopulateColumnConfig(unittest.TestCase):
     
     def _make_column(self, name, data_type, is_nullable="YES"):
         """Helper to create ColumnMeta"""
-        return ColumnMeta(
-            name=name, data_type=data_type, is_nullable=is_nullable,
-            column_type=data_type, column_key="", extra="",
-            char_max_length=None, numeric_precision=10, numeric_scale=2,
-            column_default=None
-        )
+        return _cached_column(name, data_type, is_nullable, data_type, None)
     
     def test_validate_empty_config(self):
         """Test validation of empty config"""
@@ -284,6 +327,16 @@ class TestValidatePopulateColumnConfig(unittest.TestCase):
         result = validate_populate_column_config(col, config)
         self.assertTrue(result)
     
+    def test_validate_format_string_invalid_warns(self):
+        """Test validation warns for a format string that cannot format an integer"""
+        col = self._make_column("code", "varchar")
+        config = {"column": "code", "min": 1, "max": 100, "format": "User_{:s}"}
+        with mock.patch("sys.stderr") as stderr:
+            result = validate_populate_column_config(col, config)
+        self.assertTrue(result)
+        written = "".join(c.args[0] for c in stderr.write.call_args_list)
+        self.assertIn("is invalid", written)
+    
     def test_validate_format_string_without_min_max(self):
         """Test validation warns when format is provided without min/max"""
         col = self._make_column("code", "varchar")
@@ -296,17 +349,22 @@ class TestValidatePopulateColumnConfig(unittest.TestCase):
 class TestGenerateValueWithConfig(unittest.TestCase):
     """Test the generate_value_with_config function"""
     
+    # Generated date/datetime shapes; matched fields are validated with datetime()
+    _DATE_RE = re.compile(r"(\d{4})-(\d{2})-(\d{2})$")
+    _DATETIME_RE = re.compile(r"(\d{4})-(\d{2})-(\d{2}) (\d{2}):(\d{2}):(\d{2})$")
+    
     def setUp(self):
         self.rng = random.Random(42)  # Fixed seed for reproducibility
     
+    def _parse_generated(self, value, pattern):
+        """Match a generated value against pattern and build the datetime it names"""
+        m = pattern.match(value)
+        self.assertIsNotNone(m, value)
+        return datetime(*map(int, m.groups()))
+    
     def _make_column(self, name, data_type, is_nullable="YES", column_type=None):
         """Helper to create ColumnMeta"""
-        return ColumnMeta(
-            name=name, data_type=data_type, is_nullable=is_nullable,
-            column_type=column_type or data_type, column_key="", extra="",
-            char_max_length=255, numeric_precision=10, numeric_scale=2,
-            column_default=None
-        )
+        return _cached_column(name, data_type, is_nullable, column_type or data_type, 255)
     
     def test_generate_int_with_range(self):
         """Test generating integer value with range"""
@@ -348,14 +406,8 @@ class TestGenerateValueWithConfig(unittest.TestCase):
         col = self._make_column("status", "varchar")
         config = {"column": "status", "values": ["active", "pending", "inactive"]}
         
-        # Generate multiple values and ensure they're from the list
-        values = set()
-        for _ in range(100):
-            value = generate_value_with_config(self.rng, col, config)
-            self.assertIn(value, ["active", "pending", "inactive"])
-            values.add(value)
-        
-        # Ensure all values are hit at least once (with enough iterations)
+        # Every generated value comes from the list and all are hit at least once
+        values = {generate_value_with_config(self.rng, col, config) for _ in range(100)}
         self.assertEqual(values, {"active", "pending", "inactive"})
     
     def test_generate_with_values_list_integers(self):
@@ -363,12 +415,7 @@ class TestGenerateValueWithConfig(unittest.TestCase):
         col = self._make_column("priority", "int")
         config = {"column": "priority", "values": [1, 2, 3, 4, 5]}
         
-        values = set()
-        for _ in range(100):
-            value = generate_value_with_config(self.rng, col, config)
-            self.assertIn(value, [1, 2, 3, 4, 5])
-            values.add(value)
-        
+        values = {generate_value_with_config(self.rng, col, config) for _ in range(100)}
         self.assertEqual(values, {1, 2, 3, 4, 5})
     
     def test_generate_date_with_range(self):
@@ -380,7 +427,7 @@ class TestGenerateValueWithConfig(unittest.TestCase):
             value = generate_value_with_config(self.rng, col, config)
             self.assertIsInstance(value, str)
             # Parse the generated date to verify it's valid
-            parsed = datetime.strptime(value, "%Y-%m-%d")
+            parsed = self._parse_generated(value, self._DATE_RE)
             self.assertGreaterEqual(parsed, datetime(2020, 1, 1))
             self.assertLessEqual(parsed, datetime(2024, 12, 31))
     
@@ -393,10 +440,34 @@ class TestGenerateValueWithConfig(unittest.TestCase):
             value = generate_value_with_config(self.rng, col, config)
             self.assertIsInstance(value, str)
             # Parse the generated datetime to verify it's valid
-            parsed = datetime.strptime(value, "%Y-%m-%d %H:%M:%S")
+            parsed = self._parse_generated(value, self._DATETIME_RE)
             self.assertGreaterEqual(parsed, datetime(2024, 1, 1, 0, 0, 0))
             self.assertLessEqual(parsed, datetime(2024, 12, 31, 23, 59, 59))
     
+    def test_generate_date_range_parsed_once(self):
+        """Test a date range config is parsed once, not per generated value"""
+        col = self._make_column("shipped_date", "date")
+        config = {"column": "shipped_date", "min": "2019-03-01", "max": "2019-03-31"}
+        
+        with mock.patch('generate_synthetic_data_utils.parse_date', wraps=parse_date) as spy:
+            values = [generate_value_with_config(self.rng, col, config) for _ in range(50)]
+        
+        self.assertLessEqual(spy.call_count, 2)
+        self.assertTrue(all("2019-03-01" <= v <= "2019-03-31" for v in values))
+    
+    def test_generate_datetime_range_matches_datetime_arithmetic(self):
+        """Test generated datetimes equal min + random days + random seconds"""
+        col = self._make_column("last_seen", "datetime")
+        config = {"column": "last_seen", "min": "2020-02-28 23:59:59", "max": "2020-03-02"}
+        min_date = datetime(2020, 2, 28, 23, 59, 59)
+        reference_rng = random.Random(42)
+        
+        for _ in range(200):
+            expected = min_date + timedelta(days=reference_rng.randint(0, 2),
+                                            seconds=reference_rng.randint(0, 86399))
+            value = generate_value_with_config(self.rng, col, config)
+            self.assertEqual(value, expected.strftime("%Y-%m-%d %H:%M:%S"))
+    
     def test_generate_timestamp_with_range(self):
         """Test generating timestamp value with range"""
         col = self._make_column("updated_at", "timestamp")
@@ -406,7 +477,7 @@ class TestGenerateValueWithConfig(unittest.TestCase):
             value = generate_value_with_config(self.rng, col, config)
             self.assertIsInstance(value, str)
             # Timestamp format includes time
-            parsed = datetime.strptime(value, "%Y-%m-%d %H:%M:%S")
+            parsed = self._parse_generated(value, self._DATETIME_RE)
             self.assertGreaterEqual(parsed.date(), datetime(2023, 6, 1).date())
             self.assertLessEqual(parsed.date(), datetime(2023, 12, 31).date())
     
@@ -456,9 +527,8 @@ class TestGenerateValueWithConfig(unittest.TestCase):
         config = {"column": "value", "values": [100, 200, 300], "min": 1, "max": 10}
         
         # Values should take precedence - all generated values should be from values list
-        for _ in range(50):
-            value = generate_value_with_config(self.rng, col, config)
-            self.assertIn(value, [100, 200, 300])
+        values = {generate_value_with_config(self.rng, col, config) for _ in range(50)}
+        self.assertLessEqual(values, {100, 200, 300})
     
     def test_generate_varchar_with_format(self):
         """Test generating varchar value with format string"""
@@ -529,6 +599,139 @@ class TestGenerateValueWithConfig(unittest.TestCase):
             self.assertIsInstance(value, str)
             # Should be truncated to 10 chars
             self.assertLessEqual(len(value), 10)
+    
+    def test_compiled_format_truncation_at_range_ends(self):
+        """Test compiled formats truncate exactly when a range end is too long"""
+        col = ColumnMeta(
+            name="short_code", data_type="varchar", is_nullable="YES",
+            column_type="varchar(6)", column_key="", extra="",
+            char_max_length=6, numeric_precision=None, numeric_scale=None,
+            column_default=None
+        )
+        for lo, hi in ((-99999, 5), (-999999, 5), (0, 999999), (0, 1000000)):
+            with self.subTest(lo=lo, hi=hi):
+                config = {"column": "short_code", "min": lo, "max": hi, "format": "{:d}"}
+                generator = compile_value_generator(col, config)
+                generic_rng, compiled_rng = random.Random(5), random.Random(5)
+                expected = [generate_value_with_config(generic_rng, col, config) for _ in range(50)]
+                self.assertEqual([generator(compiled_rng) for _ in range(50)], expected)
+                self.assertTrue(all(len(v) <= 6 for v in expected))
+    
+    def test_generate_values_batch_int_range(self):
+        """Test batch generation of integer range values"""
+        col = self._make_column("age", "int")
+        config = {"column": "age", "min": 18, "max": 65}
+        
+        values = generate_values_with_config(self.rng, col, config, 1000)
+        
+        self.assertEqual(len(values), 1000)
+        self.assertTrue(all(isinstance(v, int) for v in values))
+        self.assertEqual(min(values), 18)
+        self.assertEqual(max(values), 65)
+    
+    def test_generate_values_batch_values_list(self):
+        """Test batch generation from a values list"""
+        col = self._make_column("status", "varchar")
+        config = {"column": "status", "values": ["active", "pending", "inactive"]}
+        
+        values = generate_values_with_config(self.rng, col, config, 100)
+        
+        self.assertEqual(len(values), 100)
+        self.assertEqual(set(values), {"active", "pending", "inactive"})
+    
+    def test_generate_values_batch_fallback(self):
+        """Test batch generation falls back to per-value generation"""
+        col = self._make_column("created_date", "date")
+        config = {"column": "created_date", "min": "2020-01-01", "max": "2020-12-31"}
+        
+        values = generate_values_with_config(self.rng, col, config, 100)
+        
+        self.assertEqual(len(values), 100)
+        self.assertGreaterEqual(min(values), "2020-01-01")
+        self.assertLessEqual(max(values), "2020-12-31")
+    
+    def test_compiled_generator_matches_generic(self):
+        """Test compiled per-column generators reproduce generate_value_with_config"""
+        cases = [
+            ("int", {"values": [1, 2, 3]}),
+            ("int", {"min": 18, "max": 65}),
+            ("decimal", {"min": 1.5, "max": 99.5}),
+            ("varchar", {"min": 1, "max": 1000}),
+            ("varchar", {"min": 1, "max": 1000, "format": "USER_{:04d}"}),
+            ("date", {"min": "2020-01-01", "max": "2020-12-31"}),
+            ("datetime", {"min": "2020-01-01 06:00:00", "max": "2020-01-03"}),
+            ("int", {"min": 5}),
+            ("enum", {"min": 1, "max": 2}),
+        ]
+        for data_type, config in cases:
+            with self.subTest(data_type=data_type, config=config):
+                col = self._make_column("col", data_type, column_type="enum('a','b')" if data_type == "enum" else None)
+                generator = compile_value_generator(col, config)
+                generic_rng, compiled_rng = random.Random(7), random.Random(7)
+                expected = [generate_value_with_config(generic_rng, col, config) for _ in range(50)]
+                self.assertEqual([generator(compiled_rng) for _ in range(50)], expected)
+    
+    def test_compiled_generator_debug_level(self):
+        """Test compiled generators log their config at --debug level 1, like the generic path"""
+        col = self._make_column("age", "int")
+        config = {"column": "age", "min": 18, "max": 65}
+        with mock.patch.dict(GLOBALS, {"debug": False, "debug_level": 1}), \
+                mock.patch("sys.stdout") as stdout:
+            compile_value_generator(col, config)
+            generate_value_with_config(random.Random(1), col, config)
+        written = [c.args[0] for c in stdout.write.call_args_list]
+        self.assertEqual(sum("Column age: Using int range [18, 65]" in w for w in written), 2)
+    
+    def test_text_column_generator_dispatch(self):
+        """Test name-based text generators keep email > name > phone priority"""
+        self.assertIs(text_column_generator("contact_email"), rand_email)
+        self.assertIs(text_column_generator("Email_Name"), rand_email)
+        self.assertIs(text_column_generator("phone_name"), rand_name)
+        self.assertIs(text_column_generator("PHONE"), rand_phone)
+        self.assertIsNone(text_column_generator("description"))
+        self.assertTrue(is_age_column("Age"))
+        self.assertTrue(is_age_column("page_count"))
+        self.assertFalse(is_age_column("quantity"))
+    
+    def test_build_column_meta_table(self):
+        """Test column metadata is laid out as parallel per-column tuples"""
+        cols = [self._make_column("id", "INT", is_nullable="NO"),
+                self._make_column("note", None)]
+        table = build_column_meta_table(cols)
+        self.assertEqual(table.columns, tuple(cols))
+        self.assertEqual(table.names, ("id", "note"))
+        self.assertEqual(table.data_types, ("int", ""))
+        self.assertEqual(table.nullable, (False, True))
+    
+    def test_rand_string_batched_choices(self):
+        """Test rand_string draws all characters in one batch"""
+        rng = random.Random(3)
+        with mock.patch.object(rng, "choice", side_effect=AssertionError("per-character choice")):
+            value = rand_string(rng, 24)
+        self.assertEqual(len(value), 24)
+        self.assertTrue(value.isalnum())
+        self.assertEqual(rand_string(random.Random(3), 24), value)
+    
+    def test_rand_datetime_matches_strftime(self):
+        """Test default datetimes keep the '%Y-%m-%d %H:%M:%S' layout"""
+        rng, reference_rng = random.Random(9), random.Random(9)
+        start = datetime(2010, 1, 1)
+        span = int((datetime(datetime.utcnow().year, 12, 31, 23, 59, 59) - start).total_seconds())
+        for _ in range(100):
+            expected = start + timedelta(seconds=reference_rng.randint(0, span))
+            self.assertEqual(rand_datetime(rng), expected.strftime("%Y-%m-%d %H:%M:%S"))
+    
+    def test_compile_int_format(self):
+        """Test simple integer formats match str.format and others fall back"""
+        for format_str in ("User_{:08d}", "{0:x}", "ID-{}", "{:X}%", "{:o}", "{:5d}"):
+            with self.subTest(format_str=format_str):
+                int_format = compile_int_format(format_str)
+                self.assertIsNotNone(int_format)
+                for n in (0, 7, -42, 123456789):
+                    self.assertEqual(int_format(n), format_str.format(n))
+        for format_str in ("{{{}}}", "{:+d}", "{:,d}", "{} {}", "{:08.2f}", "{:s}"):
+            with self.subTest(format_str=format_str):
+                self.assertIsNone(compile_int_format(format_str))
 
 
 class TestBackwardCompatibility(unittest.TestCase):
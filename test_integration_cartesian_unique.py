@@ -13,12 +13,14 @@ Expected: 6000 unique (A_ID, C_ID) combinations from the 30,000 possible combina
 
 import sys
 import random
+from itertools import cycle, islice
 from generate_synthetic_data_utils import (
     ColumnMeta,
     UniqueConstraint,
     TableMeta,
     FKMeta,
 )
+from generate_synthetic_data_patterns import LazyCartesianProduct, sample_cartesian_product
 
 
 def simulate_cartesian_unique_fk():
@@ -26,48 +28,46 @@ def simulate_cartesian_unique_fk():
     
     # Simulate parent tables
     print("Setting up parent tables...")
-    table_a_rows = [{"ID": i} for i in range(1, 3001)]  # 3000 rows
-    table_c_rows = [{"ID": i} for i in range(1, 11)]    # 10 rows
+    # Only the parents' ID columns matter, so keep them as ranges
+    parent_a_values = range(1, 3001)  # 3000 rows
+    parent_c_values = range(1, 11)    # 10 rows
     
-    print(f"  Table A: {len(table_a_rows)} rows")
-    print(f"  Table C: {len(table_c_rows)} rows")
+    print(f"  Table A: {len(parent_a_values)} rows")
+    print(f"  Table C: {len(parent_c_values)} rows")
     
     # Simulate child table AC with UNIQUE(A_ID, C_ID)
     print("\nSimulating table AC generation...")
     
-    # Extract parent values
-    parent_a_values = [r["ID"] for r in table_a_rows]
-    parent_c_values = [r["ID"] for r in table_c_rows]
-    
     print(f"  Parent A unique values: {len(set(parent_a_values))}")
     print(f"  Parent C unique values: {len(set(parent_c_values))}")
     
-    # Generate Cartesian product
-    import itertools
-    all_combinations = list(itertools.product(parent_a_values, parent_c_values))
+    # Cartesian product of the parent A and parent C values
+    all_combinations = LazyCartesianProduct([parent_a_values, parent_c_values])
     
     print(f"\nCartesian product:")
-    print(f"  Total possible combinations: {len(all_combinations)}")
+    print(f"  Total possible combinations: {all_combinations.size}")
     
     # Request 6000 rows
     requested_rows = 6000
     print(f"  Requested rows: {requested_rows}")
     
     # Check if we have enough combinations
-    if len(all_combinations) >= requested_rows:
+    if all_combinations.size >= requested_rows:
         print(f"  ✓ Sufficient combinations available")
         
         # Sample random subset
         rng = random.Random(42)
-        rng.shuffle(all_combinations)
-        selected_combinations = all_combinations[:requested_rows]
+        selected_combinations = sample_cartesian_product(
+            [parent_a_values, parent_c_values], requested_rows, rng)
         
         print(f"\nResult:")
         print(f"  Generated rows: {len(selected_combinations)}")
-        print(f"  Unique combinations: {len(set(selected_combinations))}")
+        # Every selected (A_ID, C_ID) pair should be distinct
+        unique_count = len(set(selected_combinations))
+        print(f"  Unique combinations: {unique_count}")
         
         # Verify uniqueness
-        if len(selected_combinations) == len(set(selected_combinations)):
+        if len(selected_combinations) == unique_count:
             print(f"  ✓ All combinations are unique!")
             
             # Show sample combinations
@@ -82,7 +82,7 @@ def simulate_cartesian_unique_fk():
             print(f"  ✗ ERROR: Duplicates found!")
             return False
     else:
-        print(f"  ✗ Insufficient combinations: only {len(all_combinations)} available")
+        print(f"  ✗ Insufficient combinations: only {all_combinations.size} available")
         return False
 
 
@@ -99,32 +99,30 @@ def test_insufficient_combinations():
     print(f"  Parent A: {len(parent_a_values)} values")
     print(f"  Parent C: {len(parent_c_values)} values")
     
-    # Generate Cartesian product
-    import itertools
-    all_combinations = list(itertools.product(parent_a_values, parent_c_values))
+    # Index the Cartesian product lazily
+    all_combinations = LazyCartesianProduct([parent_a_values, parent_c_values])
     
-    print(f"  Total combinations: {len(all_combinations)}")
+    print(f"  Total combinations: {all_combinations.size}")
     
     # Request more rows than combinations
     requested_rows = 20
     print(f"  Requested rows: {requested_rows}")
     
-    if len(all_combinations) < requested_rows:
-        print(f"  ⚠ WARNING: Only {len(all_combinations)} unique combinations but {requested_rows} rows requested")
+    if all_combinations.size < requested_rows:
+        print(f"  ⚠ WARNING: Only {all_combinations.size} unique combinations but {requested_rows} rows requested")
         print(f"  Will generate duplicates by repeating combinations")
         
-        # Repeat combinations using modulo
-        extended_combinations = []
-        for i in range(requested_rows):
-            extended_combinations.append(all_combinations[i % len(all_combinations)])
+        # Repeat combinations in product order, streamed without an intermediate list
+        extended_combinations = list(islice(cycle(all_combinations), requested_rows))
         
         print(f"\nResult:")
         print(f"  Generated rows: {len(extended_combinations)}")
-        print(f"  Unique combinations: {len(set(extended_combinations))}")
+        unique_combinations = set(extended_combinations)
+        print(f"  Unique combinations: {len(unique_combinations)}")
         
         # Show all unique combinations
         print(f"\nAll unique combinations:")
-        for i, combo in enumerate(sorted(set(extended_combinations))):
+        for i, combo in enumerate(sorted(unique_combinations)):
             print(f"    Combination {i+1}: A_ID={combo[0]}, C_ID={combo[1]}")
         
         return True
@@ -147,25 +145,28 @@ def test_three_column_unique():
     print(f"  Parent B: {len(parent_b_values)} values")
     print(f"  Parent C: {len(parent_c_values)} values")
     
-    # Generate Cartesian product
-    import itertools
-    all_combinations = list(itertools.product(parent_a_values, parent_b_values, parent_c_values))
+    # Cartesian product, decoded by mixed radix: i -> (i // (B*C), (i // C) % B, i % C)
+    value_lists = [parent_a_values, parent_b_values, parent_c_values]
+    all_combinations = LazyCartesianProduct(value_lists)
     
     print(f"\nCartesian product:")
-    print(f"  Total combinations: {len(all_combinations)} (should be {10*5*3})")
+    print(f"  Total combinations: {all_combinations.size} (should be {10*5*3})")
     
     # Request subset
     requested_rows = 100
     print(f"  Requested rows: {requested_rows}")
     
-    if len(all_combinations) >= requested_rows:
+    if all_combinations.size >= requested_rows:
         rng = random.Random(42)
-        rng.shuffle(all_combinations)
-        selected = all_combinations[:requested_rows]
+        selected = sample_cartesian_product(value_lists, requested_rows, rng)
         
         print(f"\nResult:")
         print(f"  Generated rows: {len(selected)}")
-        print(f"  Unique combinations: {len(set(selected))}")
+        unique_count = len(set(selected))
+        print(f"  Unique combinations: {unique_count}")
+        assert len(selected) == requested_rows
+        assert unique_count == requested_rows, "Sampled combinations must be unique"
+        assert all(combo in all_combinations for combo in selected)
         print(f"  ✓ All combinations are unique!")
         
         # Show sample
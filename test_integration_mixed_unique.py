@@ -8,48 +8,45 @@ This test demonstrates the real-world scenario from the issue:
 """
 import sys
 import random
+from collections import Counter
+from itertools import cycle, islice
+from operator import itemgetter
 from generate_synthetic_data_utils import (
     ColumnMeta,
     UniqueConstraint,
     TableMeta,
-    FKMeta,
-    debug_print,
-    GLOBALS
+    FKMeta
 )
-import itertools
+from generate_synthetic_data_patterns import LazyCartesianProduct, sample_cartesian_product
 
 
 def test_mixed_unique_scenario():
     """Test the user's scenario: UNIQUE(A_ID, PR) with A_ID as FK and PR with explicit values."""
     print("\n=== Test 1: Mixed UNIQUE (FK + explicit values) - User Scenario ===")
     
-    # Enable debug output
-    GLOBALS["debug"] = True
-    
     # Simulate parent table A with 3000 unique IDs
     parent_a_values = list(range(1, 3001))
     
     # PR has explicit values [0, 1]
     pr_values = [0, 1]
     
-    # Generate Cartesian product
-    all_combinations = list(itertools.product(parent_a_values, pr_values))
+    # Index the Cartesian product lazily
+    all_combinations = LazyCartesianProduct([parent_a_values, pr_values])
     
     print(f"Parent A values: {len(parent_a_values)} unique IDs")
     print(f"PR values: {pr_values}")
-    print(f"Total possible combinations: {len(all_combinations)}")
+    print(f"Total possible combinations: {all_combinations.size}")
     
     # Request 6000 rows
     requested_rows = 6000
     
-    if len(all_combinations) >= requested_rows:
-        # Sample random subset
+    if all_combinations.size >= requested_rows:
+        # Sample random subset without materializing the product
         rng = random.Random(42)
-        rng.shuffle(all_combinations)
-        selected_combinations = all_combinations[:requested_rows]
+        selected_combinations = sample_cartesian_product([parent_a_values, pr_values], requested_rows, rng)
         print(f"Selected {len(selected_combinations)} unique combinations")
     else:
-        print(f"ERROR: Insufficient combinations ({len(all_combinations)} < {requested_rows})")
+        print(f"ERROR: Insufficient combinations ({all_combinations.size} < {requested_rows})")
         return False
     
     # Verify uniqueness
@@ -58,8 +55,9 @@ def test_mixed_unique_scenario():
     print(f"Duplicates: {len(selected_combinations) - len(unique_combos)}")
     
     # Check counts per PR value
-    pr_0_count = sum(1 for combo in selected_combinations if combo[1] == 0)
-    pr_1_count = sum(1 for combo in selected_combinations if combo[1] == 1)
+    pr_counts = Counter(map(itemgetter(1), selected_combinations))
+    pr_0_count = pr_counts[0]
+    pr_1_count = pr_counts[1]
     print(f"Rows with PR=0: {pr_0_count}")
     print(f"Rows with PR=1: {pr_1_count}")
     
@@ -80,28 +78,24 @@ def test_insufficient_combinations():
     # PR has explicit values [0, 1]
     pr_values = [0, 1]
     
-    # Generate Cartesian product
-    all_combinations = list(itertools.product(parent_a_values, pr_values))
+    # Index the Cartesian product lazily
+    all_combinations = LazyCartesianProduct([parent_a_values, pr_values])
     
     print(f"Parent A values: {len(parent_a_values)} unique IDs")
     print(f"PR values: {pr_values}")
-    print(f"Total possible combinations: {len(all_combinations)}")
+    print(f"Total possible combinations: {all_combinations.size}")
     
     # Request 10 rows (more than 6 combinations)
     requested_rows = 10
     
-    if len(all_combinations) < requested_rows:
-        print(f"WARNING: Only {len(all_combinations)} unique combinations but {requested_rows} rows requested")
+    if all_combinations.size < requested_rows:
+        print(f"WARNING: Only {all_combinations.size} unique combinations but {requested_rows} rows requested")
         
-        # Repeat combinations using modulo
-        extended_combinations = []
-        for i in range(requested_rows):
-            extended_combinations.append(all_combinations[i % len(all_combinations)])
-        selected_combinations = extended_combinations
+        # Repeat combinations in product order, streamed without an intermediate list
+        selected_combinations = list(islice(cycle(all_combinations), requested_rows))
     else:
         rng = random.Random(42)
-        rng.shuffle(all_combinations)
-        selected_combinations = all_combinations[:requested_rows]
+        selected_combinations = sample_cartesian_product([parent_a_values, pr_values], requested_rows, rng)
     
     print(f"Generated {len(selected_combinations)} rows")
     
@@ -111,7 +105,7 @@ def test_insufficient_combinations():
     print(f"Duplicates: {len(selected_combinations) - len(unique_combos)}")
     
     assert len(selected_combinations) == requested_rows, "Should generate requested number of rows"
-    assert len(unique_combos) == len(all_combinations), "Should have max unique combinations"
+    assert len(unique_combos) == all_combinations.size, "Should have max unique combinations"
     
     print("✓ Test passed: Repeated combinations when insufficient")
     return True
@@ -130,20 +124,20 @@ def test_multiple_non_fk_columns():
     # Priority has explicit values
     priority_values = [1, 2]
     
-    # Generate Cartesian product
-    all_combinations = list(itertools.product(parent_b_values, status_values, priority_values))
+    # Index the Cartesian product lazily
+    value_lists = [parent_b_values, status_values, priority_values]
+    all_combinations = LazyCartesianProduct(value_lists)
     
     print(f"Parent B values: {len(parent_b_values)} unique IDs")
     print(f"Status values: {status_values}")
     print(f"Priority values: {priority_values}")
-    print(f"Total possible combinations: {len(all_combinations)}")
+    print(f"Total possible combinations: {all_combinations.size}")
     
     # Request 30 rows
     requested_rows = 30
     
     rng = random.Random(42)
-    rng.shuffle(all_combinations)
-    selected_combinations = all_combinations[:requested_rows]
+    selected_combinations = sample_cartesian_product(value_lists, requested_rows, rng)
     
     print(f"Selected {len(selected_combinations)} unique combinations")
     
@@ -166,19 +160,18 @@ def test_all_non_fk_with_values():
     x_values = [1, 2, 3, 4, 5]
     y_values = ["a", "b", "c"]
     
-    # Generate Cartesian product
-    all_combinations = list(itertools.product(x_values, y_values))
+    # Index the Cartesian product lazily
+    all_combinations = LazyCartesianProduct([x_values, y_values])
     
     print(f"X values: {x_values}")
     print(f"Y values: {y_values}")
-    print(f"Total possible combinations: {len(all_combinations)}")
+    print(f"Total possible combinations: {all_combinations.size}")
     
     # Request 10 rows
     requested_rows = 10
     
     rng = random.Random(42)
-    rng.shuffle(all_combinations)
-    selected_combinations = all_combinations[:requested_rows]
+    selected_combinations = sample_cartesian_product([x_values, y_values], requested_rows, rng)
     
     print(f"Selected {len(selected_combinations)} unique combinations")
     
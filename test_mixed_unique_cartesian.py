@@ -6,6 +6,8 @@ FK and non-FK columns (that have explicit values or min/max) use Cartesian produ
 """
 import unittest
 import random
+from itertools import cycle, islice
+from generate_synthetic_data_patterns import LazyCartesianProduct
 from generate_synthetic_data_utils import (
     ColumnMeta,
     UniqueConstraint,
@@ -17,6 +19,10 @@ from generate_synthetic_data_utils import (
 class TestMixedUniqueDetection(unittest.TestCase):
     """Test detection of composite UNIQUE constraints with mixed FK/non-FK columns."""
     
+    # FK metadata shared by the tests; only the FK column names matter here
+    FK_A = FKMeta("fk_a", "db", "T", "A_ID", "db", "A", "ID", False, None)
+    FK_B = FKMeta("fk_b", "db", "T", "B_ID", "db", "B", "ID", False, None)
+    
     def _detect_controlled_constraints(self, unique_constraints, fk_map, populate_config):
         """Helper method to detect controlled constraints.
         
@@ -28,27 +34,13 @@ class TestMixedUniqueDetection(unittest.TestCase):
         Returns:
             List of controlled unique constraints
         """
-        unique_controlled_constraints = []
-        for uc in unique_constraints:
-            if len(uc.columns) < 2:
-                continue
-            
-            all_controlled = True
-            for col in uc.columns:
-                is_fk = col in fk_map
-                has_explicit_config = False
-                
-                col_config = populate_config.get(col, {})
-                has_explicit_config = "values" in col_config or "min" in col_config
-                
-                if not (is_fk or has_explicit_config):
-                    all_controlled = False
-                    break
-            
-            if all_controlled:
-                unique_controlled_constraints.append(uc)
+        # Controlled = FK column OR has explicit values/range
+        controlled_cols = set(fk_map)
+        controlled_cols.update(col for col, col_config in populate_config.items()
+                               if "values" in col_config or "min" in col_config)
         
-        return unique_controlled_constraints
+        return [uc for uc in unique_constraints
+                if len(uc.columns) >= 2 and controlled_cols.issuperset(uc.columns)]
     
     def test_detect_mixed_fk_with_explicit_values(self):
         """Test that UNIQUE constraints with FK + non-FK (explicit values) are detected."""
@@ -56,9 +48,7 @@ class TestMixedUniqueDetection(unittest.TestCase):
             UniqueConstraint("unique_a_pr", ("A_ID", "PR")),  # A_ID is FK, PR has explicit values
         ]
         
-        fk_map = {
-            "A_ID": FKMeta("fk_a", "db", "AC", "A_ID", "db", "A", "ID", False, None),
-        }
+        fk_map = {"A_ID": self.FK_A}
         
         # Simulate populate_columns config
         populate_config = {
@@ -79,9 +69,7 @@ class TestMixedUniqueDetection(unittest.TestCase):
             UniqueConstraint("unique_a_score", ("A_ID", "score")),  # A_ID is FK, score has min/max
         ]
         
-        fk_map = {
-            "A_ID": FKMeta("fk_a", "db", "T", "A_ID", "db", "A", "ID", False, None),
-        }
+        fk_map = {"A_ID": self.FK_A}
         
         populate_config = {
             "score": {"column": "score", "min": 0, "max": 100}
@@ -101,9 +89,7 @@ class TestMixedUniqueDetection(unittest.TestCase):
             UniqueConstraint("unique_a_unconfigured", ("A_ID", "unconfigured_col")),
         ]
         
-        fk_map = {
-            "A_ID": FKMeta("fk_a", "db", "T", "A_ID", "db", "A", "ID", False, None),
-        }
+        fk_map = {"A_ID": self.FK_A}
         
         populate_config = {}  # No config for unconfigured_col
         
@@ -141,10 +127,7 @@ class TestMixedUniqueDetection(unittest.TestCase):
             UniqueConstraint("unique_abc", ("A_ID", "B_ID", "status")),
         ]
         
-        fk_map = {
-            "A_ID": FKMeta("fk_a", "db", "T", "A_ID", "db", "A", "ID", False, None),
-            "B_ID": FKMeta("fk_b", "db", "T", "B_ID", "db", "B", "ID", False, None),
-        }
+        fk_map = {"A_ID": self.FK_A, "B_ID": self.FK_B}
         
         populate_config = {
             "status": {"column": "status", "values": ["active", "inactive"]}
@@ -164,16 +147,14 @@ class TestMixedCartesianProductGeneration(unittest.TestCase):
     
     def test_explicit_values_cartesian(self):
         """Test Cartesian product with explicit values array."""
-        import itertools
-        
         # Simulate parent FK values
         parent_a_values = [1, 2, 3]
         
         # Explicit values for non-FK column
         pr_values = [0, 1]
         
-        # Generate Cartesian product
-        all_combinations = list(itertools.product(parent_a_values, pr_values))
+        # Index the Cartesian product lazily, as the generator does
+        all_combinations = LazyCartesianProduct([parent_a_values, pr_values])
         
         # Should generate 3 × 2 = 6 combinations
         self.assertEqual(len(all_combinations), 6)
@@ -184,36 +165,33 @@ class TestMixedCartesianProductGeneration(unittest.TestCase):
             (2, 0), (2, 1),
             (3, 0), (3, 1)
         ]
-        self.assertEqual(sorted(all_combinations), sorted(expected))
+        self.assertEqual(list(all_combinations), expected)
     
     def test_min_max_range_cartesian(self):
         """Test Cartesian product with min/max range values."""
-        import itertools
-        
         parent_a_values = [10, 20]
         
         # Simulate generated range values (from min/max)
         score_values = [0, 50, 100]
         
-        # Generate Cartesian product
-        all_combinations = list(itertools.product(parent_a_values, score_values))
+        # Size the Cartesian product without materializing it
+        all_combinations = LazyCartesianProduct([parent_a_values, score_values])
         
         # Should generate 2 × 3 = 6 combinations
         self.assertEqual(len(all_combinations), 6)
     
     def test_multiple_non_fk_columns(self):
         """Test Cartesian product with multiple non-FK columns."""
-        import itertools
-        
         parent_a_values = [1, 2]
         status_values = ["active", "inactive"]
         priority_values = [1, 2, 3]
         
-        # Generate Cartesian product
-        all_combinations = list(itertools.product(parent_a_values, status_values, priority_values))
+        # Size the Cartesian product without materializing it
+        all_combinations = LazyCartesianProduct([parent_a_values, status_values, priority_values])
         
         # Should generate 2 × 2 × 3 = 12 combinations
         self.assertEqual(len(all_combinations), 12)
+        self.assertEqual(all_combinations[-1], (2, "inactive", 3))
 
 
 class TestInsufficientCombinations(unittest.TestCase):
@@ -221,12 +199,10 @@ class TestInsufficientCombinations(unittest.TestCase):
     
     def test_insufficient_mixed_combinations(self):
         """Test warning when mixed FK + non-FK combinations are insufficient."""
-        import itertools
-        
         parent_a_values = [1, 2, 3]  # 3 values
         pr_values = [0, 1]  # 2 values
         
-        all_combinations = list(itertools.product(parent_a_values, pr_values))
+        all_combinations = LazyCartesianProduct([parent_a_values, pr_values])
         
         # 3 × 2 = 6 combinations
         self.assertEqual(len(all_combinations), 6)
@@ -235,11 +211,8 @@ class TestInsufficientCombinations(unittest.TestCase):
         requested_rows = 10
         
         if len(all_combinations) < requested_rows:
-            # Repeat using modulo
-            extended = []
-            for i in range(requested_rows):
-                extended.append(all_combinations[i % len(all_combinations)])
-            all_combinations = extended
+            # Repeat combinations cyclically
+            all_combinations = list(islice(cycle(all_combinations), requested_rows))
         
         self.assertEqual(len(all_combinations), 10)
         
@@ -7,11 +7,20 @@ ensuring zero duplicates for ALL constraints.
 """
 import unittest
 import random
+from itertools import cycle, islice
+from operator import attrgetter, itemgetter
+from cartesian_fixtures import cartesian_rows, sampled_cartesian_rows
 
 
 class TestMultiConstraintCartesianFix(unittest.TestCase):
     """Test the fix for multi-constraint Cartesian product generation."""
     
+    # Problem-statement scenario shared by the tests
+    # (tuples, so no test can change it for the others)
+    A_ID_VALUES = tuple(range(1, 3001))  # 3000 A_IDs
+    PR_VALUES = (0, 1)  # 2 PR values
+    C_ID_VALUES = tuple(range(1, 11))  # 10 C_ID values
+    
     def test_buggy_behavior_with_max_causes_duplicates(self):
         """Demonstrate that using MAX causes duplicates in the tighter constraint."""
         # Scenario from problem statement:
@@ -20,55 +29,43 @@ class TestMultiConstraintCartesianFix(unittest.TestCase):
         # - Shared column: A_ID (3000 values)
         # - Requesting: 6000 rows
         
-        a_id_values = list(range(1, 3001))  # 3000 A_IDs
-        pr_values = [0, 1]  # 2 PR values
-        c_id_values = list(range(1, 11))  # 10 C_ID values
+        a_id_values = self.A_ID_VALUES  # 3000 A_IDs
+        pr_values = self.PR_VALUES  # 2 PR values
+        c_id_values = self.C_ID_VALUES  # 10 C_ID values
         
         # BUGGY: rows_per_shared_combo = max(2, 10) = 10
         rows_per_shared_combo = max(len(pr_values), len(c_id_values))
         
         # Generate using the buggy modulo cycling approach
-        all_combinations = []
-        for a_id in a_id_values:
-            for local_idx in range(rows_per_shared_combo):
-                combination = {
-                    'A_ID': a_id,
-                    'PR': pr_values[local_idx % len(pr_values)],  # Cycles: 0,1,0,1,0,1,0,1,0,1
-                    'C_ID': c_id_values[local_idx % len(c_id_values)],  # Cycles: 1,2,3,4,5,6,7,8,9,10
-                }
-                all_combinations.append(combination)
-        
-        self.assertEqual(len(all_combinations), 30000)  # 3000 * 10
-        
-        # Shuffle and select 6000
+        # PR cycles 0,1,0,1,... and C_ID cycles 1,2,...,10 in step, the same for every A_ID
+        cycled = list(islice(zip(cycle(pr_values), cycle(c_id_values)), rows_per_shared_combo))
+        total_rows = len(a_id_values) * len(cycled)
+        self.assertEqual(total_rows, 30000)  # 3000 * 10
+        
+        # Randomly select 6000 row indexes (the same draws as sampling the full
+        # row list) and build only those rows: row i pairs the A_ID at
+        # i // len(cycled) with the cycled (PR, C_ID) at i % len(cycled)
         random.seed(42)
-        random.shuffle(all_combinations)
-        selected = all_combinations[:6000]
+        selected = []
+        for i in random.sample(range(total_rows), 6000):
+            a_id_pos, local_idx = divmod(i, len(cycled))
+            pr, c_id = cycled[local_idx]
+            selected.append({'A_ID': a_id_values[a_id_pos], 'PR': pr, 'C_ID': c_id})
         
         # Check APR (A_ID, PR) uniqueness - SHOULD FAIL WITH BUGGY CODE
-        apr_pairs = set()
-        apr_duplicates = []
-        for row in selected:
-            pair = (row['A_ID'], row['PR'])
-            if pair in apr_pairs:
-                apr_duplicates.append(pair)
-            apr_pairs.add(pair)
+        # Rows whose (A_ID, PR) key repeats an earlier row
+        apr_duplicates = len(selected) - len(set(map(itemgetter('A_ID', 'PR'), selected)))
         
         # With the bug, APR will have duplicates
-        self.assertGreater(len(apr_duplicates), 0, 
+        self.assertGreater(apr_duplicates, 0, 
                           "Buggy code should produce APR duplicates")
     
     def test_correct_cartesian_product_generates_more_combinations(self):
         """Verify that true Cartesian product generates more unique combinations."""
-        import itertools
-        
         # Same scenario
-        a_id_values = list(range(1, 3001))  # 3000 A_IDs
-        pr_values = [0, 1]  # 2 PR values
-        c_id_values = list(range(1, 11))  # 10 C_ID values
-        
-        # CORRECT: Generate true Cartesian product
-        all_combinations = []
+        a_id_values = self.A_ID_VALUES  # 3000 A_IDs
+        pr_values = self.PR_VALUES  # 2 PR values
+        c_id_values = self.C_ID_VALUES  # 10 C_ID values
         
         # Non-shared columns for the constraints
         non_shared_value_lists = {
@@ -76,36 +73,25 @@ class TestMultiConstraintCartesianFix(unittest.TestCase):
             'C_ID': c_id_values,
         }
         
-        for a_id in a_id_values:
-            # Generate Cartesian product of all non-shared columns
-            non_shared_cols = list(non_shared_value_lists.keys())
-            value_lists = [non_shared_value_lists[col] for col in non_shared_cols]
-            
-            for combo in itertools.product(*value_lists):
-                row_assignment = {'A_ID': a_id}
-                
-                for col_name, value in zip(non_shared_cols, combo):
-                    row_assignment[col_name] = value
-                
-                all_combinations.append(row_assignment)
+        # CORRECT: Generate true Cartesian product
+        all_combinations = cartesian_rows('A_ID', a_id_values, non_shared_value_lists)
         
         # Should generate 3000 * (2 * 10) = 60,000 combinations (vs 30,000 with buggy code)
         self.assertEqual(len(all_combinations), 60000)
         
         # All 60,000 3-tuples should be unique
-        unique_tuples = set((r['A_ID'], r['PR'], r['C_ID']) for r in all_combinations)
+        # Rows are (A_ID, PR, C_ID) namedtuples, so they are the keys
+        unique_tuples = set(all_combinations)
         self.assertEqual(len(unique_tuples), 60000,
                         "All 60,000 3-tuples should be unique")
         
         # When sampling 6000 from 60,000, we get better distribution than from 30,000
         # This doesn't guarantee zero duplicates in 2-tuples, but provides more diverse combinations
-        random.seed(42)
-        random.shuffle(all_combinations)
-        selected = all_combinations[:6000]
+        selected = sampled_cartesian_rows('A_ID', a_id_values, non_shared_value_lists, 6000, seed=42)
         
         # Count unique APR pairs - with Cartesian product, this should be better
         # than with the buggy approach (though not guaranteed to be 6000)
-        apr_pairs = set((r['A_ID'], r['PR']) for r in selected)
+        apr_pairs = set(map(attrgetter('A_ID', 'PR'), selected))
         
         # With 60,000 combinations available (vs 30,000 buggy), we have more diversity
         # The exact number of unique pairs depends on random sampling, but we can verify
@@ -113,14 +99,11 @@ class TestMultiConstraintCartesianFix(unittest.TestCase):
         self.assertGreater(len(apr_pairs), 0, "Should have some unique APR pairs")
         
         # Verify all selected combinations are unique 3-tuples
-        selected_tuples = [(r['A_ID'], r['PR'], r['C_ID']) for r in selected]
-        self.assertEqual(len(set(selected_tuples)), len(selected_tuples),
+        self.assertEqual(len(set(selected)), len(selected),
                         "All selected 3-tuples should be unique")
     
     def test_cartesian_product_with_three_columns(self):
         """Test Cartesian product with three non-shared columns."""
-        import itertools
-        
         # Scenario: Three non-shared columns
         a_id_values = [1, 2, 3]  # 3 shared values
         col1_values = [10, 20]   # 2 values
@@ -134,30 +117,15 @@ class TestMultiConstraintCartesianFix(unittest.TestCase):
             'COL3': col3_values,
         }
         
-        all_combinations = []
-        for a_id in a_id_values:
-            non_shared_cols = list(non_shared_value_lists.keys())
-            value_lists = [non_shared_value_lists[col] for col in non_shared_cols]
-            
-            for combo in itertools.product(*value_lists):
-                row_assignment = {'A_ID': a_id}
-                for col_name, value in zip(non_shared_cols, combo):
-                    row_assignment[col_name] = value
-                all_combinations.append(row_assignment)
+        all_combinations = cartesian_rows('A_ID', a_id_values, non_shared_value_lists)
         
         # Should generate 3 * (2 * 3 * 2) = 36 combinations
         expected_combos = len(a_id_values) * len(col1_values) * len(col2_values) * len(col3_values)
         self.assertEqual(len(all_combinations), expected_combos)
         
-        # All should be unique
-        unique_tuples = set()
-        for row in all_combinations:
-            tuple_key = (row['A_ID'], row['COL1'], row['COL2'], row['COL3'])
-            self.assertNotIn(tuple_key, unique_tuples,
-                           f"Tuple {tuple_key} should be unique")
-            unique_tuples.add(tuple_key)
-        
-        self.assertEqual(len(unique_tuples), expected_combos)
+        # All (A_ID, COL1, COL2, COL3) tuples should be unique
+        unique_tuples = set(all_combinations)
+        self.assertEqual(len(unique_tuples), expected_combos, "All tuples should be unique")
 
 
 if __name__ == "__main__":
@@ -6,7 +6,9 @@ and both constraints are satisfied simultaneously using a multi-constraint appro
 """
 import unittest
 import sys
+from collections import defaultdict
 from io import StringIO
+from itertools import cycle, islice
 from generate_synthetic_data_utils import (
     ColumnMeta,
     UniqueConstraint,
@@ -26,7 +28,41 @@ class TestOverlappingConstraintDetection(unittest.TestCase):
     
     def tearDown(self):
         """Clean up after tests."""
+        # debug_enabled() promotes the legacy flag to debug_level 1, so reset both
         GLOBALS["debug"] = False
+        GLOBALS["debug_level"] = 0
+    
+    def _group_overlapping(self, constraints):
+        """Helper method to group constraints that share columns.
+        
+        Each constraint is grouped with every constraint sharing a column with
+        it, as in the generator; duplicate groups are kept once. Candidates come
+        from a column -> constraint index map built in one pass, so constraints
+        without common columns are never compared.
+        
+        Args:
+            constraints: List of UniqueConstraint objects
+            
+        Returns:
+            List of groups (lists of UniqueConstraint, in constraint order)
+        """
+        # Inverted index: column name -> indexes of the constraints using it
+        by_column = defaultdict(list)
+        for i, uc in enumerate(constraints):
+            for col in uc.columns:
+                by_column[col].append(i)
+        
+        groups = []
+        seen_groups = set()
+        for uc in constraints:
+            members = set()
+            for col in uc.columns:
+                members.update(by_column[col])
+            group = tuple(sorted(members))
+            if len(group) > 1 and group not in seen_groups:
+                seen_groups.add(group)
+                groups.append([constraints[j] for j in group])
+        return groups
     
     def test_detect_overlapping_constraints_with_shared_column(self):
         """Test that constraints sharing columns are detected as overlapping."""
@@ -39,24 +75,7 @@ class TestOverlappingConstraintDetection(unittest.TestCase):
         ]
         
         # Find overlapping constraints
-        overlapping_groups = []
-        if len(constraints) > 1:
-            for i, uc1 in enumerate(constraints):
-                group = set([uc1])
-                for j, uc2 in enumerate(constraints):
-                    if i != j and set(uc1.columns) & set(uc2.columns):
-                        group.add(uc2)
-                
-                if len(group) > 1:
-                    overlapping_groups.append(list(group))
-            
-            # Deduplicate groups
-            unique_groups = []
-            for group in overlapping_groups:
-                group_set = frozenset(uc.constraint_name for uc in group)
-                if not any(group_set == frozenset(uc.constraint_name for uc in g) for g in unique_groups):
-                    unique_groups.append(group)
-            overlapping_groups = unique_groups
+        overlapping_groups = self._group_overlapping(constraints)
         
         # Should detect overlapping
         self.assertEqual(len(overlapping_groups), 1)
@@ -73,24 +92,7 @@ class TestOverlappingConstraintDetection(unittest.TestCase):
         ]
         
         # Find overlapping constraints
-        overlapping_groups = []
-        if len(constraints) > 1:
-            for i, uc1 in enumerate(constraints):
-                group = set([uc1])
-                for j, uc2 in enumerate(constraints):
-                    if i != j and set(uc1.columns) & set(uc2.columns):
-                        group.add(uc2)
-                
-                if len(group) > 1:
-                    overlapping_groups.append(list(group))
-            
-            # Deduplicate groups
-            unique_groups = []
-            for group in overlapping_groups:
-                group_set = frozenset(uc.constraint_name for uc in group)
-                if not any(group_set == frozenset(uc.constraint_name for uc in g) for g in unique_groups):
-                    unique_groups.append(group)
-            overlapping_groups = unique_groups
+        overlapping_groups = self._group_overlapping(constraints)
         
         # Should not detect overlapping
         self.assertEqual(len(overlapping_groups), 0)
@@ -106,7 +108,7 @@ class TestOverlappingConstraintDetection(unittest.TestCase):
         # Find shared columns
         shared_cols = set(constraint_group[0].columns)
         for uc in constraint_group[1:]:
-            shared_cols &= set(uc.columns)
+            shared_cols.intersection_update(uc.columns)
         
         # Should find A_ID as shared
         self.assertEqual(shared_cols, {"A_ID"})
@@ -122,7 +124,7 @@ class TestOverlappingConstraintDetection(unittest.TestCase):
         # Find shared columns
         shared_cols = set(constraint_group[0].columns)
         for uc in constraint_group[1:]:
-            shared_cols &= set(uc.columns)
+            shared_cols.intersection_update(uc.columns)
         
         # Find non-shared columns for each constraint
         non_shared_for_acs = [col for col in constraint1.columns if col not in shared_cols]
@@ -142,24 +144,7 @@ class TestOverlappingConstraintDetection(unittest.TestCase):
         ]
         
         # Find overlapping constraints
-        overlapping_groups = []
-        if len(constraints) > 1:
-            for i, uc1 in enumerate(constraints):
-                group = set([uc1])
-                for j, uc2 in enumerate(constraints):
-                    if i != j and set(uc1.columns) & set(uc2.columns):
-                        group.add(uc2)
-                
-                if len(group) > 1:
-                    overlapping_groups.append(list(group))
-            
-            # Deduplicate groups
-            unique_groups = []
-            for group in overlapping_groups:
-                group_set = frozenset(uc.constraint_name for uc in group)
-                if not any(group_set == frozenset(uc.constraint_name for uc in g) for g in unique_groups):
-                    unique_groups.append(group)
-            overlapping_groups = unique_groups
+        overlapping_groups = self._group_overlapping(constraints)
         
         # Should detect all three as overlapping
         self.assertEqual(len(overlapping_groups), 1)
@@ -186,21 +171,17 @@ class TestMultiConstraintCombinationGeneration(unittest.TestCase):
             'C_ID': c_id_values,
         }
         
-        all_combinations = []
         non_shared_cols = list(non_shared_value_lists.keys())
         value_lists = [non_shared_value_lists[col] for col in non_shared_cols]
         
-        for a_id in shared_values:
-            for combo in itertools.product(*value_lists):
-                row_assignment = {'A_ID': a_id}
-                for col_name, value in zip(non_shared_cols, combo):
-                    row_assignment[col_name] = value
-                all_combinations.append(row_assignment)
+        # One value list per column (A_ID, PR, C_ID), in Cartesian-product order
+        columns = dict(zip(['A_ID'] + non_shared_cols,
+                           map(list, zip(*itertools.product(shared_values, *value_lists)))))
         
         # Should generate 3 * (2 * 10) = 60 combinations
         expected = len(shared_values) * len(pr_values) * len(c_id_values)
-        self.assertEqual(len(all_combinations), expected)
-        self.assertEqual(len(all_combinations), 60)
+        self.assertEqual(len(columns['A_ID']), expected)
+        self.assertEqual(len(columns['A_ID']), 60)
     
     def test_combination_assignment_structure(self):
         """Test that row assignments have correct structure using Cartesian product."""
@@ -217,32 +198,28 @@ class TestMultiConstraintCombinationGeneration(unittest.TestCase):
             'C_ID': c_id_values,
         }
         
-        all_combinations = []
         non_shared_cols = list(non_shared_value_lists.keys())
         value_lists = [non_shared_value_lists[col] for col in non_shared_cols]
         
-        for shared_val in shared_values:
-            for combo in itertools.product(*value_lists):
-                row_assignment = {"A_ID": shared_val}
-                for col_name, value in zip(non_shared_cols, combo):
-                    row_assignment[col_name] = value
-                all_combinations.append(row_assignment)
+        # One value list per column (A_ID, PR, C_ID), in Cartesian-product order
+        columns = dict(zip(["A_ID"] + non_shared_cols,
+                           map(list, zip(*itertools.product(shared_values, *value_lists)))))
         
         # Should generate 3 * (2 * 10) = 60 combinations
-        self.assertEqual(len(all_combinations), 60)
+        self.assertEqual(len(columns["A_ID"]), 60)
         
         # Verify all 3-tuples are unique
-        all_tuples = set((r["A_ID"], r["PR"], r["C_ID"]) for r in all_combinations)
+        all_tuples = set(zip(columns["A_ID"], columns["PR"], columns["C_ID"]))
         self.assertEqual(len(all_tuples), 60)  # All 3-tuples should be unique
         
         # Verify uniqueness of (A_ID, PR) pairs - each A_ID has each PR exactly 10 times
-        apr_pairs = [(r["A_ID"], r["PR"]) for r in all_combinations]
+        apr_pairs = list(zip(columns["A_ID"], columns["PR"]))
         # 3 A_IDs * 2 PR values = 6 unique pairs, but each appears 10 times (once per C_ID)
         unique_apr_pairs = set(apr_pairs)
         self.assertEqual(len(unique_apr_pairs), 6)  
         
         # Verify uniqueness of (A_ID, C_ID) pairs - each A_ID has each C_ID exactly 2 times
-        acs_pairs = [(r["A_ID"], r["C_ID"]) for r in all_combinations]
+        acs_pairs = list(zip(columns["A_ID"], columns["C_ID"]))
         # 3 A_IDs * 10 C_ID values = 30 unique pairs, but each appears 2 times (once per PR)
         unique_acs_pairs = set(acs_pairs)
         self.assertEqual(len(unique_acs_pairs), 30)
@@ -267,34 +244,26 @@ class TestMultiConstraintCombinationGeneration(unittest.TestCase):
             'C_ID': c_id_values,
         }
         
-        all_combinations = []
         non_shared_cols = list(non_shared_value_lists.keys())
         value_lists = [non_shared_value_lists[col] for col in non_shared_cols]
         
-        for shared_val in shared_values:
-            for combo in itertools.product(*value_lists):
-                row_assignment = {"A_ID": shared_val}
-                for col_name, value in zip(non_shared_cols, combo):
-                    row_assignment[col_name] = value
-                all_combinations.append(row_assignment)
+        # One value list per column (A_ID, PR, C_ID), in Cartesian-product order
+        columns = dict(zip(["A_ID"] + non_shared_cols,
+                           map(list, zip(*itertools.product(shared_values, *value_lists)))))
         
         # Should have 8 unique combinations (2 * 2 * 2)
-        self.assertEqual(len(all_combinations), 8)
+        self.assertEqual(len(columns["A_ID"]), 8)
         
-        # Extend to 20 by repeating
-        if len(all_combinations) < requested_rows:
-            extended_combinations = []
-            for i in range(requested_rows):
-                extended_combinations.append(all_combinations[i % len(all_combinations)])
-            all_combinations = extended_combinations
+        # Extend to 20 by repeating (every column cycles in step)
+        if len(columns["A_ID"]) < requested_rows:
+            columns = {col_name: list(islice(cycle(values), requested_rows))
+                       for col_name, values in columns.items()}
         
         # Should now have 20 rows
-        self.assertEqual(len(all_combinations), 20)
+        self.assertEqual(len(columns["A_ID"]), 20)
         
         # But only 8 unique combinations
-        unique_combos = set()
-        for r in all_combinations:
-            unique_combos.add((r["A_ID"], r["PR"], r["C_ID"]))
+        unique_combos = set(zip(columns["A_ID"], columns["PR"], columns["C_ID"]))
         self.assertEqual(len(unique_combos), 8)
 
 
@@ -5,6 +5,7 @@ import random
 from generate_synthetic_data_utils import (
     generate_value_with_config,
     validate_set_value,
+    parse_enum_values,
     ColumnMeta
 )
 
@@ -63,6 +64,14 @@ class TestValidateSetValue(unittest.TestCase):
         set_definition = "set('read','write','execute')"
         self.assertTrue(validate_set_value(set_definition, "read, write"))
         self.assertTrue(validate_set_value(set_definition, " read , write "))
+    
+    def test_parse_enum_values_cached(self):
+        """Test ENUM/SET member lists are parsed once per column type"""
+        set_definition = "set('read','it''s','')"
+        values = parse_enum_values(set_definition)
+        self.assertEqual(values, ("read", "it's", ""))
+        self.assertIs(parse_enum_values(set_definition), values)
+        self.assertEqual(parse_enum_values(None), ())
 
 
 class TestGenerateSetValueWithConfig(unittest.TestCase):
@@ -7,7 +7,11 @@ overlapping UNIQUE constraints.
 """
 import unittest
 import random
-from collections import defaultdict
+from collections import Counter, defaultdict
+from itertools import cycle, islice
+from operator import attrgetter
+from cartesian_fixtures import cartesian_rows, sampled_cartesian_rows, stratified_smart_selection
+from generate_synthetic_data_patterns import LazyCartesianProduct
 
 
 class TestStratifiedSampling(unittest.TestCase):
@@ -22,36 +26,20 @@ class TestStratifiedSampling(unittest.TestCase):
         # - 60,000 total combinations
         # - Requesting 6,000 rows
         
-        import itertools
-        
         a_id_values = list(range(1, 3001))  # 3000 A_IDs
         pr_values = [0, 1]  # 2 PR values
         c_id_values = list(range(1, 11))  # 10 C_ID values
         
-        # Generate all combinations using Cartesian product
-        all_combinations = []
-        non_shared_value_lists = {'PR': pr_values, 'C_ID': c_id_values}
-        non_shared_cols = list(non_shared_value_lists.keys())
-        value_lists = [non_shared_value_lists[col] for col in non_shared_cols]
-        
-        for a_id in a_id_values:
-            for combo in itertools.product(*value_lists):
-                combination = {'A_ID': a_id}
-                for col_name, value in zip(non_shared_cols, combo):
-                    combination[col_name] = value
-                all_combinations.append(combination)
+        # 3000 * 2 * 10 = 60,000 possible combinations
+        value_lists = [a_id_values, pr_values, c_id_values]
+        self.assertEqual(LazyCartesianProduct(value_lists).size, 60000)
         
-        self.assertEqual(len(all_combinations), 60000)
-        
-        # BUGGY APPROACH: Random shuffle and take first 6000
-        random.seed(42)
-        random.shuffle(all_combinations)
-        selected = all_combinations[:6000]
+        # BUGGY APPROACH: Random selection of 6000 (equivalent to shuffle and take first 6000)
+        non_shared_value_lists = {'PR': pr_values, 'C_ID': c_id_values}
+        selected = sampled_cartesian_rows('A_ID', a_id_values, non_shared_value_lists, 6000, seed=42)
         
         # Count how many times each A_ID appears
-        a_id_counts = defaultdict(int)
-        for row in selected:
-            a_id_counts[row['A_ID']] += 1
+        a_id_counts = Counter(map(attrgetter('A_ID'), selected))
         
         # With random sampling, distribution is uneven
         unique_a_ids = len(a_id_counts)
@@ -61,13 +49,8 @@ class TestStratifiedSampling(unittest.TestCase):
                        "Random sampling should result in missing A_IDs")
         
         # Check for duplicates in APR constraint
-        apr_pairs = set()
-        apr_duplicates = 0
-        for row in selected:
-            pair = (row['A_ID'], row['PR'])
-            if pair in apr_pairs:
-                apr_duplicates += 1
-            apr_pairs.add(pair)
+        # Rows whose (A_ID, PR) key repeats an earlier row
+        apr_duplicates = len(selected) - len(set(map(attrgetter('A_ID', 'PR'), selected)))
         
         # Random sampling causes duplicates
         self.assertGreater(apr_duplicates, 0,
@@ -79,38 +62,14 @@ class TestStratifiedSampling(unittest.TestCase):
     
     def test_stratified_sampling_ensures_balance(self):
         """Verify that stratified sampling with smart diversity ensures all shared values appear correctly."""
-        import itertools
-        
         a_id_values = list(range(1, 3001))  # 3000 A_IDs
         pr_values = [0, 1]  # 2 PR values
         c_id_values = list(range(1, 11))  # 10 C_ID values
         
-        # Generate all combinations using Cartesian product
-        all_combinations = []
-        non_shared_value_lists = {'PR': pr_values, 'C_ID': c_id_values}
-        non_shared_cols = list(non_shared_value_lists.keys())
-        value_lists = [non_shared_value_lists[col] for col in non_shared_cols]
-        
-        for a_id in a_id_values:
-            for combo in itertools.product(*value_lists):
-                combination = {'A_ID': a_id}
-                for col_name, value in zip(non_shared_cols, combo):
-                    combination[col_name] = value
-                all_combinations.append(combination)
-        
-        self.assertEqual(len(all_combinations), 60000)
-        
         # FIXED APPROACH: Smart Stratified sampling with diversity
-        primary_shared_col = 'A_ID'
         shared_values = a_id_values
         requested_rows = 6000
         
-        # Group combinations by shared value (A_ID)
-        combos_by_shared_val = defaultdict(list)
-        for combo in all_combinations:
-            shared_val = combo[primary_shared_col]
-            combos_by_shared_val[shared_val].append(combo)
-        
         # Calculate rows per shared value
         rows_per_shared_val = requested_rows // len(shared_values)
         remainder = requested_rows % len(shared_values)
@@ -118,83 +77,20 @@ class TestStratifiedSampling(unittest.TestCase):
         self.assertEqual(rows_per_shared_val, 2, "Should be 2 rows per A_ID")
         self.assertEqual(remainder, 0, "Should divide evenly")
         
-        # Select stratified with smart diversity
-        random.seed(42)
-        selected_combinations = []
-        shared_values_list = list(shared_values)
-        random.shuffle(shared_values_list)  # Randomize order
-        
-        constraint_non_shared_cols = ['PR', 'C_ID']
-        
-        for idx, shared_val in enumerate(shared_values_list):
-            available = combos_by_shared_val[shared_val]
-            num_rows_for_this_val = rows_per_shared_val + (1 if idx < remainder else 0)
-            
-            # SMART SELECTION: Ensure diversity in all constraint columns
-            selected = []
-            smart_selection_succeeded = False
-            
-            if num_rows_for_this_val > 1 and num_rows_for_this_val <= 10 and len(constraint_non_shared_cols) >= 1:
-                # Try to ensure diversity in the first constraint column
-                first_col = constraint_non_shared_cols[0]
-                by_first_col = defaultdict(list)
-                for combo in available:
-                    by_first_col[combo[first_col]].append(combo)
-                
-                first_col_values = list(by_first_col.keys())
-                
-                # If we have enough distinct values in first column, select one from each
-                if len(first_col_values) >= num_rows_for_this_val:
-                    random.shuffle(first_col_values)
-                    
-                    # Now ensure diversity in other constraint columns too
-                    used_values = defaultdict(set)  # Track used values for each column
-                    
-                    for first_val in first_col_values[:num_rows_for_this_val]:
-                        candidates = by_first_col[first_val]
-                        
-                        # Filter candidates to maximize diversity in other columns
-                        best_candidate = None
-                        for candidate in candidates:
-                            # Check if this candidate adds diversity
-                            conflicts = 0
-                            for col in constraint_non_shared_cols[1:]:
-                                if candidate[col] in used_values[col]:
-                                    conflicts += 1
-                            
-                            if conflicts == 0 or best_candidate is None:
-                                best_candidate = candidate
-                                if conflicts == 0:
-                                    break  # Found a perfect candidate
-                        
-                        if best_candidate is None:
-                            best_candidate = random.choice(candidates)
-                        
-                        selected.append(best_candidate)
-                        
-                        # Mark values as used
-                        for col in constraint_non_shared_cols:
-                            used_values[col].add(best_candidate[col])
-                    
-                    smart_selection_succeeded = True
-            
-            # If smart selection didn't work, fall back to random selection
-            if not smart_selection_succeeded:
-                random.shuffle(available)
-                selected = available[:num_rows_for_this_val]
-            
-            selected_combinations.extend(selected)
-        
-        # Shuffle final selection
-        random.shuffle(selected_combinations)
+        # Select stratified with smart diversity: (A_ID, PR, C_ID) tuples
+        rng = random.Random(42)
+        selected_combinations = stratified_smart_selection(
+            shared_values, [pr_values, c_id_values], requested_rows, rng)
         
         self.assertEqual(len(selected_combinations), 6000)
         
-        # Verify all A_IDs present
-        a_id_counts = defaultdict(int)
-        for row in selected_combinations:
-            a_id_counts[row['A_ID']] += 1
+        # Per-A_ID counts and APR/ACS duplicates of the selection
+        a_id_col, pr_col, c_id_col = zip(*selected_combinations)
+        a_id_counts = Counter(a_id_col)
+        apr_duplicates = len(selected_combinations) - len(set(zip(a_id_col, pr_col)))
+        acs_duplicates = len(selected_combinations) - len(set(zip(a_id_col, c_id_col)))
         
+        # Verify all A_IDs present
         unique_a_ids = len(a_id_counts)
         self.assertEqual(unique_a_ids, 3000,
                         "All 3000 A_IDs should be present")
@@ -205,26 +101,10 @@ class TestStratifiedSampling(unittest.TestCase):
                            f"A_ID {a_id} should appear exactly 2 times, got {count}")
         
         # Verify NO duplicates in APR constraint
-        apr_pairs = set()
-        apr_duplicates = 0
-        for row in selected_combinations:
-            pair = (row['A_ID'], row['PR'])
-            if pair in apr_pairs:
-                apr_duplicates += 1
-            apr_pairs.add(pair)
-        
         self.assertEqual(apr_duplicates, 0,
                         "Smart stratified sampling should eliminate APR duplicates")
         
         # Verify NO duplicates in ACS constraint
-        acs_pairs = set()
-        acs_duplicates = 0
-        for row in selected_combinations:
-            pair = (row['A_ID'], row['C_ID'])
-            if pair in acs_pairs:
-                acs_duplicates += 1
-            acs_pairs.add(pair)
-        
         self.assertEqual(acs_duplicates, 0,
                         "Smart stratified sampling should eliminate ACS duplicates")
         
@@ -235,8 +115,6 @@ class TestStratifiedSampling(unittest.TestCase):
     
     def test_stratified_sampling_with_remainder(self):
         """Test stratified sampling when rows don't divide evenly."""
-        import itertools
-        
         # Scenario: 100 shared values, 10 non-shared values, 101 rows requested
         # rows_per_shared_val = 101 // 100 = 1
         # remainder = 101 % 100 = 1
@@ -247,22 +125,13 @@ class TestStratifiedSampling(unittest.TestCase):
         requested_rows = 101
         
         # Generate all combinations
-        all_combinations = []
-        for shared_val in shared_values:
-            for non_shared_val in non_shared_values:
-                all_combinations.append({
-                    'SHARED': shared_val,
-                    'NON_SHARED': non_shared_val
-                })
+        all_combinations = cartesian_rows('SHARED', shared_values, {'NON_SHARED': non_shared_values})
         
         self.assertEqual(len(all_combinations), 1000)  # 100 * 10
         
-        # Stratified sampling
-        primary_shared_col = 'SHARED'
-        combos_by_shared_val = defaultdict(list)
-        for combo in all_combinations:
-            shared_val = combo[primary_shared_col]
-            combos_by_shared_val[shared_val].append(combo)
+        # Stratified sampling: rows come grouped by shared value, so the value
+        # at position i owns the slice [i * stride, (i + 1) * stride)
+        stride = len(non_shared_values)
         
         rows_per_shared_val = requested_rows // len(shared_values)
         remainder = requested_rows % len(shared_values)
@@ -272,23 +141,20 @@ class TestStratifiedSampling(unittest.TestCase):
         
         random.seed(42)
         selected_combinations = []
-        shared_values_list = list(shared_values)
-        random.shuffle(shared_values_list)
+        shared_positions = list(range(len(shared_values)))
+        random.shuffle(shared_positions)
         
-        for idx, shared_val in enumerate(shared_values_list):
-            available = combos_by_shared_val[shared_val]
+        for idx, shared_pos in enumerate(shared_positions):
+            available = all_combinations[shared_pos * stride:(shared_pos + 1) * stride]
             num_rows_for_this_val = rows_per_shared_val + (1 if idx < remainder else 0)
             
-            random.shuffle(available)
-            selected = available[:num_rows_for_this_val]
+            selected = random.sample(available, num_rows_for_this_val)
             selected_combinations.extend(selected)
         
         self.assertEqual(len(selected_combinations), 101)
         
         # Count distribution
-        shared_counts = defaultdict(int)
-        for row in selected_combinations:
-            shared_counts[row['SHARED']] += 1
+        shared_counts = Counter(map(attrgetter('SHARED'), selected_combinations))
         
         # Verify: 1 shared value has 2 rows, 99 have 1 row
         values_with_2 = sum(1 for count in shared_counts.values() if count == 2)
@@ -300,8 +166,6 @@ class TestStratifiedSampling(unittest.TestCase):
     
     def test_stratified_sampling_more_rows_than_shared_values(self):
         """Test when requested rows > shared values."""
-        import itertools
-        
         # Scenario: 10 shared values, 5 non-shared values, 100 rows requested
         # rows_per_shared_val = 100 // 10 = 10
         # Each shared value should get 10 rows
@@ -311,13 +175,7 @@ class TestStratifiedSampling(unittest.TestCase):
         requested_rows = 100
         
         # Generate all combinations (50 total: 10 * 5)
-        all_combinations = []
-        for shared_val in shared_values:
-            for non_shared_val in non_shared_values:
-                all_combinations.append({
-                    'SHARED': shared_val,
-                    'NON_SHARED': non_shared_val
-                })
+        all_combinations = cartesian_rows('SHARED', shared_values, {'NON_SHARED': non_shared_values})
         
         self.assertEqual(len(all_combinations), 50)
         
@@ -327,19 +185,14 @@ class TestStratifiedSampling(unittest.TestCase):
         
         # Simulate extension
         if len(all_combinations) < requested_rows:
-            extended = []
-            for i in range(requested_rows):
-                extended.append(all_combinations[i % len(all_combinations)])
-            all_combinations = extended
+            all_combinations = list(islice(cycle(all_combinations), requested_rows))
         
         self.assertEqual(len(all_combinations), 100)
         
         # Now stratified sampling should work
-        primary_shared_col = 'SHARED'
         combos_by_shared_val = defaultdict(list)
         for combo in all_combinations:
-            shared_val = combo[primary_shared_col]
-            combos_by_shared_val[shared_val].append(combo)
+            combos_by_shared_val[combo.SHARED].append(combo)
         
         rows_per_shared_val = requested_rows // len(shared_values)
         remainder = requested_rows % len(shared_values)
@@ -26,7 +26,9 @@ class TestTightestConstraintSelection(unittest.TestCase):
     
     def tearDown(self):
         """Clean up after tests."""
+        # debug_enabled() promotes the legacy flag to debug_level 1, so reset both
         GLOBALS["debug"] = False
+        GLOBALS["debug_level"] = 0
     
     def _calculate_combo_count(self, constraint, fk_map, populate_config, generated_rows):
         """Helper method to calculate combination count for a constraint.
@@ -55,9 +57,9 @@ class TestTightestConstraintSelection(unittest.TestCase):
                 if parent_node in generated_rows:
                     parent_rows = generated_rows[parent_node]
                     parent_col = fk.referenced_column_name
-                    parent_vals = [r.get(parent_col) for r in parent_rows if r and r.get(parent_col) is not None]
-                    unique_vals = len(set(parent_vals))
-                    combo_count *= unique_vals
+                    parent_vals = {r.get(parent_col) for r in parent_rows if r}
+                    parent_vals.discard(None)
+                    combo_count *= len(parent_vals)
                 else:
                     # Parent not generated yet - can't calculate
                     combo_count = float('inf')
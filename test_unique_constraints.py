@@ -1,9 +1,11 @@
 #!/usr/bin/env python3
 """Unit tests for UNIQUE constraint handling with populate_columns"""
 import unittest
+from unittest import mock
 import random
 from generate_synthetic_data_utils import (
     generate_unique_value_pool,
+    sample_range,
     ColumnMeta,
     GLOBALS
 )
@@ -166,6 +168,15 @@ class TestGenerateUniqueValuePool(unittest.TestCase):
             self.assertGreaterEqual(val, 1)
             self.assertLessEqual(val, 10000000)
     
+    def test_sample_range_does_not_materialize(self):
+        """Test range sampling draws distinct values without shuffling the whole range"""
+        with mock.patch.object(self.rng, "shuffle", side_effect=AssertionError("range shuffled")):
+            values = sample_range(self.rng, 10, 10 ** 30, 50)
+            self.assertEqual(len(set(values)), 50)
+            self.assertTrue(all(10 <= v < 10 ** 30 for v in values))
+            self.assertEqual(sorted(sample_range(self.rng, 1, 6, 20)), [1, 2, 3, 4, 5])
+            self.assertEqual(sample_range(self.rng, 5, 1, 3), [])
+    
     def test_shuffled_output(self):
         """Test that output is shuffled (not in order)"""
         col = self._make_column("code", "int")